@@ -0,0 +1,164 @@
+import io
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+import file_system
+
+# micro-benchmarks for the storage layer
+# usage: python bench.py codec [megabytes]
+#        python bench.py stress [processes] [iterations] [shared|local]
+#        python bench.py sqlite [players]
+
+def legacy_encrypt(text):
+    return bytearray([b ^ file_system.XOR_KEY for b in text.encode('utf-8')])
+
+def legacy_decrypt(data):
+    return bytearray([b ^ file_system.XOR_KEY for b in data]).decode('utf-8')
+
+def fake_users(megabytes):
+    # users.bin-style text of roughly the requested size
+    lines = []
+    size, i = 0, 0
+    while size < megabytes * 1024 * 1024:
+        line = (f"name:player{i}|avg_time:{30 + i % 97}.5|games:{i % 40 + 1}|"
+                f"total_time:{(30 + i % 97) * (i % 40 + 1)}.0|word:TIGER|guesses:EAGLE,TIGER")
+        lines.append(line)
+        size += len(line) + 1
+        i += 1
+    return "\n".join(lines)
+
+def timed(fn, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def bench_codec(megabytes=4):
+    text = fake_users(megabytes)
+    mb = len(text.encode('utf-8')) / (1024 * 1024)
+    print(f"codec benchmark on {mb:.1f} MB of user records")
+
+    t_old_enc, data = timed(legacy_encrypt, text)
+    t_new_enc, new_data = timed(file_system.custom_encrypt, text)
+    assert new_data == data, "encrypt output differs from the legacy codec"
+
+    t_old_dec, _ = timed(legacy_decrypt, data)
+    t_new_dec, decoded = timed(file_system.custom_decrypt, data)
+    assert decoded == text, "decrypt output differs from the legacy codec"
+
+    def streamed():
+        return "".join(file_system.iter_decrypt(io.BytesIO(bytes(data)), 256 * 1024))
+    t_stream, decoded = timed(streamed)
+    assert decoded == text
+
+    for label, t in [("legacy encrypt", t_old_enc), ("fast encrypt", t_new_enc),
+                     ("legacy decrypt", t_old_dec), ("fast decrypt", t_new_dec),
+                     ("streamed decrypt", t_stream)]:
+        print(f"  {label:<17} {t * 1000:8.2f} ms  {mb / t:9.1f} MB/s")
+    print(f"  decrypt speedup   {t_old_dec / t_new_dec:8.1f}x")
+
+# stress: N processes saving into one data folder at the same time
+# workers are spawned fresh so they import file_system with the storage mode set
+CONTENDED = 4   # players every process records wins for
+
+def stress_worker(job):
+    proc, iterations = job
+    file_system.STORE.capacity = None # every process keeps its own slot
+    stats = file_system.load_player_stats()
+    for i in range(iterations):
+        file_system.save_session(f"proc{proc}", {"target": "TIGER", "guesses": [f"G{i:04d}"], "category": "ANIMALS"})
+        stats.record_win(f"player{i % CONTENDED}", 1.0, "TIGER", "TIGER")
+        file_system.save_time_score(60, proc * iterations + i, f"proc{proc}")
+
+def stress_check(job):
+    # what a fresh instance reads back once everyone is done
+    procs, iterations = job
+    stats = file_system.load_player_stats()
+    games = sum(stats.find_user(f"player{p}")['games'] for p in range(CONTENDED) if stats.find_user(f"player{p}"))
+    sessions = [file_system.load_session(f"proc{p}") for p in range(procs)]
+    sessions_ok = sum(1 for s in sessions if s and s['guesses'] == [f"G{iterations - 1:04d}"])
+    scores = [r['score'] for r in file_system.load_time_stats_list()]
+    return games, sessions_ok, scores
+
+def bench_stress(procs=8, iterations=200, mode="shared"):
+    folder = tempfile.mkdtemp(prefix="wordle-stress-")
+    cwd = os.getcwd()
+    os.environ["WORDLE_STORAGE"] = mode
+    try:
+        os.chdir(folder)
+        os.makedirs(file_system.DATA_DIR)
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(procs) as pool:
+            start = time.perf_counter()
+            pool.map(stress_worker, [(p, iterations) for p in range(procs)])
+            seconds = time.perf_counter() - start
+        with ctx.Pool(1) as pool:
+            games, sessions_ok, scores = pool.apply(stress_check, ((procs, iterations),))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(folder, ignore_errors=True)
+
+    saves = procs * iterations
+    expected = sorted(range(saves), reverse=True)[:20]
+    print(f"stress ({mode}): {procs} processes x {iterations} iterations, "
+          f"{saves * 3} saves in {seconds:.2f}s ({saves * 3 / seconds:,.0f} saves/s)")
+    print(f"  wins recorded     {games} / {saves}")
+    print(f"  sessions intact   {sessions_ok} / {procs}")
+    print(f"  time attack top   {'ok' if scores == expected else 'WRONG'}")
+    lost = saves - games + procs - sessions_ok + (scores != expected)
+    print("  no lost updates" if lost == 0 else "  LOST UPDATES")
+    return lost == 0
+
+def bench_sqlite(players=100000):
+    # per-query cost of the SQLite backend on a big board
+    from sqlite_backend import SQLiteBackend, PUT_PLAYER
+    folder = tempfile.mkdtemp(prefix="wordle-sqlite-")
+    try:
+        db = SQLiteBackend(os.path.join(folder, "wordle.db"), import_files=False)
+        rows = [(f"player{i}", 30 + i % 997 + i / players, i % 40 + 1, 0.0, "TIGER", "TIGER") for i in range(players)]
+        t_fill, _ = timed(lambda: db.run("bench", lambda con: con.executemany(PUT_PLAYER, rows)), repeat=1)
+        stats = db.load_player_stats()
+
+        n = 1000
+        def wins():
+            for i in range(n):
+                stats.record_win(f"player{i * 97 % players}", 12.5)
+        def lookups():
+            for i in range(n):
+                stats.find_user(f"player{i * 89 % players}")
+        def views():
+            for i in range(n):
+                stats.refresh().to_list()
+        def sessions():
+            for i in range(n):
+                db.save_session(f"player{i}", {"target": "TIGER", "guesses": ["EAGLE"], "category": "ANIMALS"})
+                db.load_session(f"player{i}")
+        print(f"sqlite benchmark on {players} players (filled in {t_fill:.2f}s)")
+        for label, fn in [("record win", wins), ("find user", lookups), ("top-20 view", views),
+                          ("save+load session", sessions)]:
+            t, _ = timed(fn, repeat=1)
+            print(f"  {label:<18} {t / n * 1e6:8.1f} us")
+        t, _ = timed(lambda: len(stats), repeat=1)
+        print(f"  {'count players':<18} {t * 1e6:8.1f} us")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+if __name__ == "__main__":
+    what = sys.argv[1] if len(sys.argv) > 1 else "codec"
+    if what == "codec":
+        bench_codec(float(sys.argv[2]) if len(sys.argv) > 2 else 4)
+    elif what == "stress":
+        procs = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+        iterations = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+        mode = sys.argv[4] if len(sys.argv) > 4 else "shared"
+        if not bench_stress(procs, iterations, mode):
+            sys.exit(1)
+    elif what == "sqlite":
+        bench_sqlite(int(sys.argv[2]) if len(sys.argv) > 2 else 100000)
+    else:
+        print(f"unknown benchmark: {what}")
@@ -0,0 +1,118 @@
+import math
+import multiprocessing
+import sys
+import time
+import numpy as np
+from file_system import get_lexicon, get_calibration, CALIBRATION, CALIBRATION_MARGIN, CALIBRATION_MAX_GUESSES
+from hints import partition_entropy
+from logic import WIN_CODE, encode_words, check_guesses_batch
+
+# category difficulty from an entropy solver playing every word of the lexicon
+# usage: python calibrate.py [workers]
+
+# (guess, candidate) cells scored per solver decision
+SOLVE_CELLS = 1 << 21
+
+# lexicons up to this size are calibrated in-process at startup
+AUTO_CALIBRATE_WORDS = 5000
+
+def pick_guess(codes, cand):
+    # most informative remaining candidate to guess next
+    # big candidate sets are judged on an even sample of guesses and targets
+    side = math.isqrt(SOLVE_CELLS)
+    if len(cand) > side:
+        sample = cand[np.linspace(0, len(cand) - 1, side).astype(np.intp)]
+    else:
+        sample = cand
+    rows = max(1, SOLVE_CELLS // len(sample))
+    pool = sample if len(cand) > rows else cand
+    h = partition_entropy(check_guesses_batch(codes[pool], codes[sample]))
+    return pool[int(np.argmax(h))]
+
+def branch(codes, cand):
+    # guesses once, returns (guess, [candidates left for each feedback pattern])
+    g = pick_guess(codes, cand)
+    row = check_guesses_batch(codes[g:g + 1], codes[cand])[0]
+    rest = row != WIN_CODE
+    cand, row = cand[rest], row[rest]
+    order = np.argsort(row, kind='stable')
+    cand, row = cand[order], row[order]
+    cuts = np.flatnonzero(np.diff(row)) + 1
+    return g, np.split(cand, cuts) if len(cand) else []
+
+def solve(words, depth=1):
+    # guesses the solver needs for each word, from one walk of its decision tree
+    codes = encode_words(words)
+    out = np.zeros(len(words), dtype=np.int32)
+    stack = [(np.arange(len(words)), depth)]
+    while stack:
+        cand, d = stack.pop()
+        if len(cand) == 1:
+            out[cand[0]] = d
+            continue
+        g, groups = branch(codes, cand)
+        out[g] = d
+        stack.extend((group, d + 1) for group in groups)
+    return out
+
+def solve_job(job):
+    # worker entry: (category, words, depth) -> (category, words, guesses)
+    category, words, depth = job
+    return category, words, solve(words, depth)
+
+def split_jobs(lex):
+    # first guess of every category in-process, one job per branch below it
+    jobs, results = [], []
+    for category, entry in lex.categories.items():
+        words = list(dict.fromkeys(w.strip().upper() for w in entry['words'] if len(w.strip()) == 5))
+        if not words:
+            continue
+        codes = encode_words(words)
+        g, groups = branch(codes, np.arange(len(words)))
+        results.append((category, [words[g]], np.ones(1, dtype=np.int32)))
+        jobs += [(category, [words[i] for i in group], 2) for group in groups]
+    jobs.sort(key=lambda job: -len(job[1])) # biggest subtrees first keeps the pool busy
+    return jobs, results
+
+def calibrate(workers=None):
+    # solves the whole lexicon and caches the results under its checksum
+    lex = get_lexicon()
+    jobs, results = split_jobs(lex)
+    if workers == 1:
+        results += map(solve_job, jobs)
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            results += pool.imap_unordered(solve_job, jobs, chunksize=1)
+
+    words = {}
+    for category, group, guesses in results:
+        for w, g in zip(group, guesses):
+            words[(category, w)] = int(g)
+
+    categories = {}
+    for category, entry in lex.categories.items():
+        solved = [words[(category, w)] for w in dict.fromkeys(w.strip().upper() for w in entry['words']) if (category, w) in words]
+        for w in entry['words']:
+            words.setdefault((category, w.strip().upper()), 0) # not 5 letters, can't be typed
+        if solved:
+            # the hand-set value stays the floor; hard categories get more room
+            # capped at what the grid can show (unless words.txt asks for more)
+            diff = max(entry['diff'], min(max(solved) + CALIBRATION_MARGIN, CALIBRATION_MAX_GUESSES))
+            categories[category] = (sum(solved) / len(solved), max(solved), diff)
+
+    CALIBRATION.save(lex.checksum, categories, words)
+    return categories
+
+def ensure_calibration():
+    # keeps the cache in step with words.txt; big lexicons wait for a manual run
+    # and an empty one has nothing to solve
+    if 0 < len(get_lexicon().all_words) <= AUTO_CALIBRATE_WORDS and get_calibration() is None:
+        calibrate(workers=1)
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    start = time.perf_counter()
+    categories = calibrate(workers)
+    for category, (expected, worst, diff) in categories.items():
+        print(f"{category:<12} expected {expected:4.2f}  worst {worst}  max guesses {diff}")
+    print(f"calibrated {len(get_lexicon().all_words)} words in {time.perf_counter() - start:.2f}s")
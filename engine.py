@@ -0,0 +1,130 @@
+import time
+from logic import check_guess
+from structures import Stack, GameState
+from file_system import get_random_mix
+
+# game rules with no display attached
+# the pygame screens drive these, and so does the bulk simulator
+
+def mark_letters(letters, guess, target):
+    # best known status of each letter after one more guess
+    # 2:Green, 1:Yellow, 0:Gray, missing: not guessed yet
+    res = check_guess(guess, target)
+    out = letters
+    for i, char in enumerate(guess):
+        if res[i] > out.get(char, -1):
+            if out is letters: out = dict(letters)
+            out[char] = res[i]
+    return out
+
+class GameEngine:
+    # one classic game: submit, undo, redo, win/lose
+    def __init__(self, target, max_guesses, guesses=(), undo_limit=None, clock=time.time):
+        self.target = target
+        self.max_guesses = max_guesses
+        self.clock = clock
+        self.start_time = clock()
+        self.result = None
+
+        # stacks hold immutable GameStates that share their history, so nothing is copied
+        self.undo_stack = Stack(undo_limit)
+        self.redo_stack = Stack(undo_limit)
+        letters = {}
+        for g in guesses:
+            letters = mark_letters(letters, g, target)
+        self.state = GameState.from_guesses(guesses, letters)
+
+    @property
+    def guesses(self):
+        return self.state.guesses()
+
+    @property
+    def letters(self):
+        return self.state.keys
+
+    @property
+    def over(self):
+        return self.result is not None
+
+    def feedback(self):
+        # (guess, check_guess result) for every guess so far
+        return [(g, check_guess(g, self.target)) for g in self.guesses]
+
+    def submit(self, guess):
+        # returns "SHORT", "NEXT", "WIN" or "LOSE" (None once the game is over)
+        if self.over:
+            return None
+        if len(guess) != 5:
+            return "SHORT"
+
+        self.undo_stack.push(self.state)
+        self.state = self.state.push(guess, mark_letters(self.state.keys, guess, self.target))
+        if guess == self.target:
+            self.finish("WIN")
+        elif len(self.state) >= self.max_guesses:
+            self.finish("LOSE")
+        return self.result['res'] if self.over else "NEXT"
+
+    def finish(self, res):
+        # 'target' and 'guesses' are kept for the leaderboard history view
+        self.result = {
+            "res": res,
+            "time": self.clock() - self.start_time,
+            "target": self.target,
+            "guesses": list(self.guesses)
+        }
+
+    def undo(self):
+        if self.over or self.undo_stack.is_empty():
+            return False
+        # save current state to Redo before undoing
+        self.redo_stack.push(self.state)
+        self.state = self.undo_stack.pop()
+        return True
+
+    def redo(self):
+        if self.over or self.redo_stack.is_empty():
+            return False
+        # save current state back to Undo before redoing
+        self.undo_stack.push(self.state)
+        self.state = self.redo_stack.pop()
+        return True
+
+class TimeAttackEngine:
+    # back-to-back rounds from random categories until the clock runs out
+    def __init__(self, duration, new_round=get_random_mix, clock=time.time):
+        self.duration = duration
+        self.new_round = new_round
+        self.clock = clock
+        self.start_time = clock()
+        self.score = 0
+        self.time_up = False
+        self.last_round = None # (guesses, target, category, max_guesses) of the finished round
+        self.next_round()
+
+    def next_round(self):
+        self.category, target, max_guesses = self.new_round()
+        self.round = GameEngine(target, max_guesses, clock=self.clock)
+
+    def remaining(self):
+        return max(0, self.duration - (self.clock() - self.start_time))
+
+    def tick(self):
+        # True exactly once, on the call that notices the time is up
+        if not self.time_up and self.remaining() == 0:
+            self.time_up = True
+            return True
+        return False
+
+    def submit(self, guess):
+        # same outcomes as GameEngine.submit; a finished round starts the next one
+        if self.time_up:
+            return None
+        outcome = self.round.submit(guess)
+        if outcome in ("WIN", "LOSE"):
+            if outcome == "WIN":
+                self.score += 1
+            r = self.round
+            self.last_round = (r.guesses, r.target, self.category, r.max_guesses)
+            self.next_round()
+        return outcome
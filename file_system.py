@@ -1,186 +1,1085 @@
 import os
+import atexit
+import queue
+import codecs
+import datetime
+import mmap
 import random
+import struct
+import threading
 import time 
-from structures import LinkedList
+import zlib
+import numpy as np
+try:
+    import fcntl
+except ImportError: # not available on Windows; shared storage falls back to local
+    fcntl = None
+from collections.abc import Sequence
+from concurrent.futures import Future
+from contextlib import contextmanager, ExitStack
+from structures import Leaderboard, TimeAttackBoard
 
 # paths
 DATA_DIR = "assets/data/" 
 WORDS_FILE = DATA_DIR + "words.txt"
+WORDS_BIN_FILE = DATA_DIR + "words.bin"
 USERS_FILE = DATA_DIR + "users.bin"
 SESSIONS_FILE = DATA_DIR + "sessions.bin"
 TIME_STATS_FILE = DATA_DIR + "time_stats.bin"
+PLAYERS_FILE = DATA_DIR + "players.bin"
+CALIBRATION_FILE = DATA_DIR + "calibration.txt"
+DATABASE_FILE = DATA_DIR + "wordle.db"
 
 # simple XOR encryption key
 XOR_KEY = 157
 
+# durability of committed writes: "none", "file" (fsync file) or "dir" (also fsync the directory)
+DURABILITY = "file"
+
+# seconds to hold writes so back-to-back saves share one commit (0 = commit immediately)
+WRITE_WINDOW = 0.0
+
+# "local" for a single game instance, "shared" when several instances use the same
+# data folder: advisory file locks, per-player shards, and catching up on other
+# instances' changes before every write so they merge instead of overwriting
+STORAGE_MODE = os.environ.get("WORDLE_STORAGE", "local")
+SHARDS = 8
+
+data_dir_ok = False
+
 def ensure_data_dir():
-    # ensure data directory exists
+    # ensure data directory exists (checked once per run)
+    global data_dir_ok
+    if data_dir_ok: return
     try:
         # check if possible to write a test file to the directory
         with open(DATA_DIR + ".exists", 'w') as f:
             f.write("test")
+        data_dir_ok = True
     except FileNotFoundError:
         # if the directory doesn't exist, notify the user
         print(f"Critical Error: Folder {DATA_DIR} not found. Please create it manually.")
 
+# byte -> byte ^ XOR_KEY, so the XOR runs in C via bytes.translate
+XOR_TABLE = bytes(b ^ XOR_KEY for b in range(256))
+
 def custom_encrypt(text):
-    return bytearray([b ^ XOR_KEY for b in text.encode('utf-8')])
+    return bytearray(text.encode('utf-8').translate(XOR_TABLE))
 
 def custom_decrypt(data):
-    return bytearray([b ^ XOR_KEY for b in data]).decode('utf-8')
+    return bytes(data).translate(XOR_TABLE).decode('utf-8')
+
+def iter_decrypt(f, chunk_size=1 << 20):
+    # decodes an open binary file chunk by chunk, yielding text pieces
+    # the incremental decoder keeps multi-byte characters split across chunks intact
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        yield decoder.decode(chunk.translate(XOR_TABLE))
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
 
 # word management
+def parse_words(text):
+    # words.txt lines: category|max guesses|word,word,...
+    categories = {}
+    for line in text.splitlines():
+        parts = line.strip().split('|')
+        if len(parts) == 3:
+            categories[parts[0]] = {"diff": int(parts[1]), "words": tuple(parts[2].split(','))}
+    return categories
+
+class Lexicon:
+    # words.txt, served from its compiled form (see compile_lexicon) so loading
+    # doesn't grow with the word list; reloaded only when the file changes on disk
+    def __init__(self, path=WORDS_FILE, compiled=None):
+        self.path = path
+        self.compiled_path = compiled or os.path.splitext(path)[0] + ".bin"
+        self.stamp = None       # (mtime, size) of the parsed file
+        self.categories = {}    # cat -> {"diff": int, "words": sequence}
+        self.cat_names = ()
+        self.all_words = ()     # every word of every category, flattened
+        self.checksum = None    # crc32 of the file contents
+
+    def refresh(self):
+        # re-parse only if the file changed since the last load
+        try:
+            st = os.stat(self.path)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+        if stamp != self.stamp:
+            self.load()
+            self.stamp = stamp
+        return self
+
+    def load(self):
+        try:
+            self.load_compiled()
+        except (OSError, ValueError):
+            # no words.txt, a bad line, or a folder we can't write to
+            self.load_text()
+
+    def load_compiled(self):
+        lex = load_compiled_lexicon(self.path, self.compiled_path)
+        self.categories = {cat: {"diff": diff, "words": lex.view(start, count)}
+                           for cat, (diff, start, count) in lex.categories.items()}
+        self.checksum = lex.source_crc
+        self.cat_names = tuple(self.categories)
+        self.all_words = lex.view(0, len(lex))
+
+    def load_text(self):
+        categories = {}
+        checksum = None
+        try:
+            with open(self.path, 'r') as f:
+                text = f.read()
+            checksum = zlib.crc32(text.encode('utf-8'))
+            categories = parse_words(text)
+        except FileNotFoundError:
+            pass
+        self.categories = categories
+        self.checksum = checksum
+        self.cat_names = tuple(categories)
+        self.all_words = tuple(w for c in categories.values() for w in c['words'])
+
+    def random_word(self):
+        return random.choice(self.all_words)
+
+    def random_category(self):
+        return random.choice(self.cat_names)
+
+LEXICON = Lexicon()
+
+def get_lexicon():
+    return LEXICON.refresh()
+
 def load_words():
-    data = {}
-    try:
-        with open(WORDS_FILE, 'r') as f:
-            for line in f:
-                parts = line.strip().split('|')
-                if len(parts) == 3:
-                    cat = parts[0]
-                    diff = int(parts[1])
-                    word_list = parts[2].split(',')
-                    data[cat] = {"diff": diff, "words": word_list}
-    except FileNotFoundError: 
-        return {}
-    return data
+    # returns {cat: {"diff": int, "words": tuple}} from the cached lexicon
+    return {cat: dict(entry) for cat, entry in get_lexicon().categories.items()}
 
 def get_standard_word():
-    data = load_words()
-    all_words = []
-    for cat in data: all_words.extend(data[cat]['words'])
-    if not all_words: return "ERROR", 6
-    return random.choice(all_words).upper(), 6
+    lex = get_lexicon()
+    if not lex.all_words: return "ERROR", 6
+    return lex.random_word().upper(), 6
 
 def get_random_word(category):
-    data = load_words()
-    if category not in data: return None, 6
-    words = data[category]['words']
-    return random.choice(words).upper(), data[category]['diff']
+    lex = get_lexicon()
+    if category not in lex.categories: return None, 6
+    entry = lex.categories[category]
+    return random.choice(entry['words']).upper(), category_diff(category)
 
 def get_random_mix():
-    data = load_words()
-    if not data: return "ERROR", "ERROR", 6
-    cats = list(data.keys())
-    random_cat = random.choice(cats)
-    word_list = data[random_cat]['words']
-    difficulty = data[random_cat]['diff']
-    target_word = random.choice(word_list).upper()
-    return random_cat, target_word, difficulty
+    lex = get_lexicon()
+    if not lex.cat_names: return "ERROR", "ERROR", 6
+    random_cat = lex.random_category()
+    entry = lex.categories[random_cat]
+    target_word = random.choice(entry['words']).upper()
+    return random_cat, target_word, category_diff(random_cat)
+
+# calibrated difficulty: solver results per category and word (see calibrate.py)
+#   checksum|<lexicon crc32>
+#   cat|<category>|<expected guesses>|<worst guesses>|<max guesses>
+#   word|<category>|<word>|<guesses, 0 = unsolvable>
+
+# extra guesses on top of the solver's worst case when deriving max guesses
+# (the words.txt value is kept as a minimum)
+CALIBRATION_MARGIN = 3
+# most rows the game grid fits above the keyboard; calibration never goes past it
+CALIBRATION_MAX_GUESSES = 6
+
+class Calibration:
+    # calibration.txt parsed once, reloaded only when the file changes on disk
+    def __init__(self, path=CALIBRATION_FILE):
+        self.path = path
+        self.stamp = None
+        self.checksum = None    # lexicon checksum the results belong to
+        self.categories = {}    # cat -> (expected, worst, max guesses)
+        self.words = {}         # (cat, word) -> guesses
+
+    def disk_stamp(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def refresh(self):
+        stamp = self.disk_stamp()
+        if stamp != self.stamp:
+            self.load()
+            self.stamp = stamp
+        return self
+
+    def load(self):
+        checksum, categories, words = None, {}, {}
+        try:
+            with open(self.path, 'r') as f:
+                for line in f:
+                    parts = line.strip().split('|')
+                    if parts[0] == "checksum" and len(parts) == 2:
+                        checksum = int(parts[1])
+                    elif parts[0] == "cat" and len(parts) == 5:
+                        categories[parts[1]] = (float(parts[2]), int(parts[3]), int(parts[4]))
+                    elif parts[0] == "word" and len(parts) == 4:
+                        words[(parts[1], parts[2])] = int(parts[3])
+        except (FileNotFoundError, ValueError):
+            checksum, categories, words = None, {}, {}
+        self.checksum, self.categories, self.words = checksum, categories, words
+
+    def save(self, checksum, categories, words):
+        lines = [f"checksum|{checksum}"]
+        lines += [f"cat|{c}|{e:.4f}|{w}|{d}" for c, (e, w, d) in categories.items()]
+        lines += [f"word|{c}|{word}|{g}" for (c, word), g in words.items()]
+        self.checksum, self.categories, self.words = checksum, dict(categories), dict(words)
+        ensure_data_dir()
+        try:
+            atomic_write(self.path, ("\n".join(lines) + "\n").encode('utf-8'))
+            self.stamp = None
+        except OSError:
+            # keep the results for this run; refresh() won't reload until the file changes
+            print(f"Error: could not save {self.path}")
+            self.stamp = self.disk_stamp()
+
+CALIBRATION = Calibration()
+
+def get_calibration():
+    # cached solver results, or None if they were made for a different lexicon
+    cal = CALIBRATION.refresh()
+    if cal.checksum is None or cal.checksum != get_lexicon().checksum:
+        return None
+    return cal
 
+def category_diff(category):
+    # max guesses for a category: calibrated when available, else the words.txt value
+    entry = get_lexicon().categories.get(category)
+    if entry is None:
+        return 6
+    cal = get_calibration()
+    if cal is not None and category in cal.categories:
+        # older calibration files may predate the cap
+        return min(cal.categories[category][2], max(entry['diff'], CALIBRATION_MAX_GUESSES))
+    return entry['diff']
+
+
+# compiled lexicon: fixed-width word records behind a small header
+#   header   magic, version, record width, n_cats, n_words, crc32, words.txt crc32, records offset,
+#            words.txt mtime (ns) and size it was compiled from
+#   cat table per category: name offset, name length, diff, first word index, word count
+#   names    utf-8 category names, back to back
+#   records  n_words * width bytes, utf-8 padded with zero bytes, grouped by category
+#            (width is 5 for a list of plain 5-letter words)
+LEX_MAGIC = b"WLEX"
+LEX_VERSION = 3
+LEX_HEADER = struct.Struct('<4sHHIIIIIqQ')
+LEX_CAT = struct.Struct('<IIiII')
+
+def compile_lexicon(src=WORDS_FILE, dst=WORDS_BIN_FILE):
+    # converts words.txt into the packed binary format
+    st = os.stat(src) # before reading, so an edit made meanwhile still looks newer
+    with open(src, 'r') as f:
+        text = f.read()
+    table, names = b"", b""
+    records = []
+    for cat, entry in parse_words(text).items():
+        words = [w.strip().upper().encode('utf-8') for w in entry['words']]
+        name = cat.encode('utf-8')
+        try:
+            table += LEX_CAT.pack(len(names), len(name), entry['diff'], len(records), len(words))
+        except struct.error:
+            raise ValueError(f"{cat}: max guesses {entry['diff']} out of range")
+        names += name
+        records.extend(words)
+    n_cats = len(table) // LEX_CAT.size
+    width = max([5, *map(len, records)])
+    if width > 0xFFFF:
+        raise ValueError("word too long for a compiled lexicon record")
+    body = table + names + b"".join(w.ljust(width, b"\0") for w in records)
+    header = LEX_HEADER.pack(LEX_MAGIC, LEX_VERSION, width, n_cats, len(records), zlib.crc32(body),
+                             zlib.crc32(text.encode('utf-8')), LEX_HEADER.size + len(table) + len(names),
+                             st.st_mtime_ns, st.st_size)
+    # a cache of words.txt, so it isn't worth an fsync
+    atomic_write(dst, header + body, durability="none")
+    return len(records)
+
+class CompiledLexicon:
+    # memory-mapped view of a compiled lexicon; nothing is copied at load
+    def __init__(self, path=WORDS_BIN_FILE):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, self.width, n_cats, self.n_words, self.crc, self.source_crc,
+             self.offset, mtime, size) = LEX_HEADER.unpack_from(self.mm, 0)
+        except struct.error:
+            raise ValueError(f"{path} is not a compiled lexicon")
+        if magic != LEX_MAGIC or version != LEX_VERSION:
+            raise ValueError(f"{path} is not a compiled lexicon")
+        # a cut-off file; the full checksum is left to verify()
+        if len(self.mm) != self.offset + self.n_words * self.width:
+            raise ValueError(f"{path} is truncated")
+        self.source_stamp = (mtime, size)
+
+        # category name -> (diff, first word index, word count)
+        self.categories = {}
+        names = LEX_HEADER.size + n_cats * LEX_CAT.size
+        for i in range(n_cats):
+            at, size, diff, start, count = LEX_CAT.unpack_from(self.mm, LEX_HEADER.size + i * LEX_CAT.size)
+            self.categories[self.mm[names + at:names + at + size].decode('utf-8')] = (diff, start, count)
+
+    def __len__(self):
+        return self.n_words
+
+    def verify(self):
+        # checksum over the category table, names and records; reads the whole file,
+        # so it runs after compiling, not on every load
+        with memoryview(self.mm) as view, view[LEX_HEADER.size:] as body:
+            return zlib.crc32(body) == self.crc
+
+    def word_bytes(self, i):
+        # zero-copy view of record i, padding included
+        pos = self.offset + i * self.width
+        return memoryview(self.mm)[pos:pos + self.width]
+
+    def word(self, i):
+        pos = self.offset + i * self.width
+        return self.mm[pos:pos + self.width].rstrip(b"\0").decode('utf-8')
+
+    def view(self, start, count):
+        return WordView(self, start, count)
+
+    def category_words(self, cat):
+        diff, start, count = self.categories[cat]
+        return self.view(start, count)
+
+    def as_array(self):
+        # (n_words, width) uint8 numpy view straight over the mapped file, padding included
+        return np.frombuffer(self.mm, dtype=np.uint8, count=self.n_words * self.width,
+                             offset=self.offset).reshape(-1, self.width)
+
+    def letter_codes(self):
+        # (word indices, (k, 5) codes) of the plain 5-letter words, ready for check_guesses_batch
+        # a view over the file when every record is one, otherwise a copy of those rows
+        arr = self.as_array()
+        ok = ((arr[:, :5] > 0) & (arr[:, :5] < 128)).all(axis=1)
+        if self.width > 5:
+            ok &= (arr[:, 5:] == 0).all(axis=1)
+        idx = np.flatnonzero(ok)
+        if self.width == 5 and len(idx) == self.n_words:
+            return idx, arr
+        return idx, arr[idx, :5]
+
+    def random_word(self, cat=None):
+        if cat is None:
+            return self.word(random.randrange(self.n_words))
+        diff, start, count = self.categories[cat]
+        return self.word(start + random.randrange(count))
+
+class WordView(Sequence):
+    # a run of records read as a tuple of words; words are decoded when asked for
+    def __init__(self, lex, start, count):
+        self.lex = lex
+        self.start = start
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return tuple(self)[i]
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("word index out of range")
+        return self.lex.word(self.start + i)
+
+    def __iter__(self):
+        # one read for the whole run
+        w = self.lex.width
+        pos = self.lex.offset + self.start * w
+        data = self.lex.mm[pos:pos + self.count * w]
+        return (data[i:i + w].rstrip(b"\0").decode('utf-8') for i in range(0, len(data), w))
+
+def load_compiled_lexicon(src=WORDS_FILE, dst=WORDS_BIN_FILE):
+    # mmaps the compiled lexicon, recompiling it first if words.txt isn't the
+    # file (mtime and size) it was compiled from, or it doesn't read back
+    st = os.stat(src)
+    try:
+        lex = CompiledLexicon(dst)
+        if lex.source_stamp == (st.st_mtime_ns, st.st_size):
+            return lex
+        lex.mm.close()
+    except (OSError, ValueError):
+        pass
+    compile_lexicon(src, dst)
+    lex = CompiledLexicon(dst)
+    if not lex.verify():
+        raise ValueError(f"{dst} failed its checksum")
+    return lex
 
 # change word every day at midnight UTC
+# daily word: each season (calendar year, UTC) gets its own shuffle of the lexicon,
+# made with a private RNG, and day n of the season is word n of that shuffle
+DAILY_SALT = "wordle-daily"
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+class DailySchedule:
+    def __init__(self, salt=DAILY_SALT):
+        self.salt = salt
+        self.key = None     # (season, lexicon checksum) the order was built for
+        self.first_day = 0  # day index of the season's first day
+        self.order = ()     # no-repeat permutation of the season's words
+        self.today = None   # (day index, word)
+
+    def season_order(self, season):
+        # builds the permutation once per season and lexicon
+        lex = get_lexicon()
+        key = (season, lex.checksum)
+        if key != self.key:
+            # only words that can be typed, each once
+            words = [w for w in dict.fromkeys(w.strip().upper() for w in lex.all_words) if len(w) == 5]
+            rng = random.Random(f"{self.salt}|{season}|{lex.checksum}")
+            rng.shuffle(words)
+            self.key = key
+            self.first_day = datetime.date(season, 1, 1).toordinal() - EPOCH_ORDINAL
+            self.order = tuple(words)
+            self.today = None
+        return self.order
+
+    def word_for_day(self, day):
+        # day = days since 1970-01-01 (UTC); words only repeat once a season outlasts the lexicon
+        season = (datetime.date.fromordinal(EPOCH_ORDINAL + day)).year
+        order = self.season_order(season)
+        if not order:
+            return None
+        return order[(day - self.first_day) % len(order)]
+
+    def word_for_today(self):
+        day = int(time.time() // 86400)
+        lex_key = get_lexicon().checksum
+        if self.today is None or self.today[0] != day or self.key[1] != lex_key:
+            self.today = (day, self.word_for_day(day))
+        return self.today[1]
+
+    def emit_year(self, year):
+        # full schedule of a season for auditing: ["YYYY-MM-DD|WORD", ...]
+        start = datetime.date(year, 1, 1)
+        lines = []
+        for i in range((datetime.date(year + 1, 1, 1) - start).days):
+            d = start + datetime.timedelta(days=i)
+            lines.append(f"{d.isoformat()}|{self.word_for_day(d.toordinal() - EPOCH_ORDINAL)}")
+        return lines
+
+DAILY = DailySchedule()
+
 def get_timed_word():
-    data = load_words()
-    all_words = []
-    for cat in data:
-        all_words.extend(data[cat]['words'])
-        
-    if not all_words: 
+    target = DAILY.word_for_today()
+    if target is None:
         return "ERROR", 6
-    
-    # calculate the number of days since epoch
-    interval_index = int(time.time() // 86400)
-    
-    # use the interval as a seed for consistent randomization
-    random.seed(interval_index)
-    target = random.choice(all_words).upper()
-    
-    # reset seed to system time
-    random.seed() 
-    
     return target, 6
 
-# time attack stats management
-def save_time_score(duration, score, username):
-    # saves a new time attack score and trims to top 20
-    ensure_data_dir()
-    
-    # 1. load all current records into a list of dictionaries
-    all_records = []
+# write coordination
+def fsync_dir(path):
     try:
-        with open(TIME_STATS_FILE, 'rb') as f:
-            content = custom_decrypt(f.read())
-            if content:
-                parts = content.split('|')
-                for p in parts:
-                    if ':' in p:
-                        segments = p.split(':')
-                        if len(segments) >= 3:
-                            all_records.append({
-                                'dur': segments[0],
-                                'score': int(segments[1]),
-                                'name': segments[2]
-                            })
-    except (FileNotFoundError, IOError):
-        pass
+        fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+    except OSError:
+        return # not supported on this platform
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
-    # 2. add the new record
-    all_records.append({
-        'dur': str(duration),
-        'score': score,
-        'name': username
-    })
+def atomic_write(path, data, durability=None):
+    # writes to a temp file in the same folder, then renames it over the target
+    durability = durability or DURABILITY
+    tmp = path + ".tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        if durability != "none":
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+    if durability == "dir":
+        fsync_dir(path)
 
-    # 3. sort by score (descending) and then duration (descending)
-    all_records.sort(key=lambda x: (x['score'], int(x['dur'])), reverse=True)
+def append_file(path, data, durability=None):
+    durability = durability or DURABILITY
+    with open(path, 'ab') as f:
+        f.write(data)
+        if durability != "none":
+            f.flush()
+            os.fsync(f.fileno())
 
-    # 4. limit to 20 accounts
-    top_20 = all_records[:20]
+class FileLock:
+    # advisory lock on a side file, shared by every process using the data folder
+    # re-entrant within the process; callers serialize threads with their own lock
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+        self.depth = 0
 
-    # 5. serialize and save, format: "dur:score:name|dur:score:name"
-    lines = [f"{r['dur']}:{r['score']}:{r['name']}" for r in top_20]
-    full_text = "|".join(lines)
-    
-    try:
-        with open(TIME_STATS_FILE, 'wb') as f:
-            f.write(custom_encrypt(full_text))
-    except IOError:
-        print("Error saving Time Attack leaderboard.")
+    def __enter__(self):
+        if self.depth == 0:
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        self.depth += 1
+        return self
 
-def load_time_stats_list():
-    #returns a sorted list of dictionaries for the leaderboard UI
-    records = []
-    try:
-        with open(TIME_STATS_FILE, 'rb') as f:
-            content = custom_decrypt(f.read())
-            if not content: return []
-            parts = content.split('|')
-            for p in parts:
-                segments = p.split(':')
-                if len(segments) >= 3:
-                    records.append({
-                        'dur': segments[0],
-                        'score': int(segments[1]),
-                        'name': segments[2]
-                    })
-    except (FileNotFoundError, IOError):
-        pass
-    return records
+    def __exit__(self, *exc):
+        self.depth -= 1
+        if self.depth == 0:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            os.close(self.fd)
+            self.fd = None
 
-def load_time_stats():
-    # returns time stats as a dict for quick lookup
-    stats = {}
-    try:
-        with open(TIME_STATS_FILE, 'rb') as f:
-            content = custom_decrypt(f.read())
-            if not content: return {}
-            parts = content.split('|')
-            for p in parts:
-                if ':' in p:
-                    segments = p.split(':')
-                    # safety check for format
-                    if len(segments) >= 2:
-                        k = segments[0]
-                        try:
-                            v = int(segments[1])
-                            name = segments[2] if len(segments) > 2 else "Unknown"
-                            stats[k] = {'score': v, 'name': name}
-                        except ValueError:
-                            print(f"Skipping corrupt stat: {p}")
-    except (FileNotFoundError, IOError): 
-        pass
-    return stats
+class WriteCoordinator:
+    # stages file changes and commits them together
+    # a path is either replaced whole (temp file + rename) or appended to, once per commit
+    def __init__(self, window=0.0, durability=None):
+        self.window = window
+        self.durability = durability
+        self.pending = {}   # path -> [replacement bytes or None, [appended chunks]]
+        self.depth = 0      # open batch() blocks
+        self.timer = None
+        self.lock = threading.RLock()
+
+    def replace(self, path, data):
+        with self.lock:
+            # moves to the end: commits run in staging order, so a compaction's
+            # snapshot lands before the fresh log even if the log had appends waiting
+            self.pending.pop(path, None)
+            self.pending[path] = [data, []]
+            return self.staged()
+
+    def append(self, path, data):
+        with self.lock:
+            self.pending.setdefault(path, [None, []])[1].append(data)
+            return self.staged()
+
+    def staged(self):
+        # commits now unless a batch or a write window is holding writes back
+        if self.depth:
+            return True
+        if self.window > 0:
+            if self.timer is None:
+                self.timer = threading.Timer(self.window, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+            return True
+        return self.flush()
+
+    @contextmanager
+    def batch(self):
+        # everything saved inside the block is committed once at the end
+        with self.lock:
+            self.depth += 1
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.flush()
+
+    def flush(self):
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            pending, self.pending = self.pending, {}
+            durability = self.durability or DURABILITY
+
+            ok = True
+            for path, (replacement, chunks) in pending.items():
+                try:
+                    if replacement is not None:
+                        atomic_write(path, replacement + b"".join(chunks), "file" if durability != "none" else "none")
+                    else:
+                        append_file(path, b"".join(chunks), durability)
+                except IOError:
+                    print(f"Error: could not write {path}")
+                    ok = False
+
+            # one directory sync covers every rename in this commit
+            if durability == "dir" and pending:
+                for folder in {os.path.dirname(p) for p in pending}:
+                    fsync_dir(os.path.join(folder, ""))
+            return ok
+
+WRITER = WriteCoordinator(WRITE_WINDOW)
+atexit.register(WRITER.flush)
+
+# append-only journal
+# the .bin file stays the snapshot in its original format; changes since the
+# last compaction are appended to <file>.log as framed, checksummed records:
+#   <payload length u32><crc32 u32><payload>, payload = XOR(op + key + "\0" + entry)
+# the first record ("G") holds the crc of the snapshot it applies to, so a log
+# left behind by an interrupted compaction is recognised as stale and dropped
+LOG_FRAME = struct.Struct('<II')
+
+# in shared mode every write happens under the journal's file lock, right after
+# reading whatever other instances appended since (snapshot stamp + log offset),
+# and goes straight to disk instead of through WRITER
+class Journal:
+    def __init__(self, path, sep, key_of, order=None, min_garbage=64, shared=False):
+        self.path = path
+        self.log_path = path + ".log"
+        self.sep = sep              # entry separator used by the snapshot
+        self.key_of = key_of        # (entry, position) -> key, for snapshot entries
+        self.order = order          # optional: sorts (key, entry) pairs for the snapshot
+        self.min_garbage = min_garbage
+        self.entries = {}           # key -> entry, in file order
+        self.garbage = 0            # log records made obsolete by later ones
+        self.loaded = False
+        self.generation = 0         # bumped whenever entries changed under us (reload, rekey, merge)
+        self.changes = None         # keys changed under us since take_changes(); None = can't tell
+                                    # (also before the first call, so nobody tracks what nobody reads)
+        self.lock = threading.RLock()
+        self.compactor = None
+        self.shared = shared
+        self.flock = FileLock(path + ".lock") if shared else None
+        self.seen = None            # snapshot stamp the entries were read from
+        self.log_pos = 0            # log bytes already applied
+
+    def paths(self):
+        return (self.path, self.log_path)
+
+    @contextmanager
+    def held(self):
+        # the file lock in shared mode, nothing otherwise
+        if self.flock is None:
+            yield
+        else:
+            with self.flock:
+                yield
+
+    @contextmanager
+    def locked(self, key=None):
+        # up-to-date entries that nobody else can change until the block ends
+        # (key is for ShardedJournal, a plain journal locks everything)
+        with self.lock, self.held():
+            if self.shared:
+                self.sync()
+            else:
+                self.ensure_loaded()
+            yield self
+
+    def disk_version(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_ino, st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def snapshot_bytes(self):
+        WRITER.flush() # staged writes must land before reading back
+        try:
+            with open(self.path, 'rb') as f:
+                return f.read()
+        except (FileNotFoundError, IOError):
+            return b""
+
+    def load(self):
+        # returns the keys whose entries differ from what we had
+        with self.lock, self.held():
+            old = self.entries
+            self.seen = self.disk_version()
+            raw = self.snapshot_bytes()
+            self.entries = {}
+            self.garbage = 0
+            content = custom_decrypt(raw) if raw else ""
+            for i, entry in enumerate(content.split(self.sep) if content else []):
+                key = self.key_of(entry, i)
+                if key is not None:
+                    self.entries[key] = entry
+            self.replay(zlib.crc32(raw))
+            self.loaded = True
+            self.generation += 1
+            changed = {k for k in old.keys() | self.entries.keys() if old.get(k) != self.entries.get(k)}
+            self.note_changes(changed)
+            return changed
+
+    def ensure_loaded(self):
+        if not self.loaded:
+            self.load()
+
+    def reload(self):
+        # shared mode only reads what other instances appended since the last look
+        # returns the keys that changed
+        with self.lock, self.held():
+            if self.shared:
+                return self.sync()
+            return self.load()
+
+    def note_changes(self, keys):
+        if self.changes is not None:
+            self.changes |= keys
+
+    def take_changes(self):
+        # keys changed under us since the last call, or None if that isn't known
+        with self.lock:
+            changes, self.changes = self.changes, set()
+            return changes
+
+    def replay(self, snapshot_crc):
+        # applies the log on top of the snapshot, cutting off a torn tail
+        try:
+            with open(self.log_path, 'rb') as f:
+                data = f.read()
+        except (FileNotFoundError, IOError):
+            return self.reset_log(snapshot_crc)
+
+        records, pos = self.read_records(data)
+
+        # a missing or mismatched base means the snapshot already holds everything
+        if not records or records[0] != f"G{snapshot_crc}":
+            return self.reset_log(snapshot_crc)
+
+        self.apply(records[1:])
+        self.log_pos = pos
+
+        if pos < len(data):
+            with open(self.log_path, 'r+b') as f:
+                f.truncate(pos)
+
+    def read_records(self, data):
+        # decoded records up to the first torn or corrupt one, and where they end
+        pos, records = 0, []
+        while pos + LOG_FRAME.size <= len(data):
+            length, crc = LOG_FRAME.unpack_from(data, pos)
+            payload = data[pos + LOG_FRAME.size:pos + LOG_FRAME.size + length]
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                break
+            records.append(custom_decrypt(payload))
+            pos += LOG_FRAME.size + length
+        return records, pos
+
+    def apply(self, records):
+        for rec in records:
+            key, _, entry = rec[1:].partition("\0")
+            if key in self.entries:
+                self.garbage += 1
+            if rec[0] == "P":
+                self.entries[key] = entry
+            elif rec[0] == "D":
+                self.entries.pop(key, None)
+                self.garbage += 1
+
+    def sync(self):
+        # shared mode, lock held: picks up what other instances wrote since we last looked
+        # returns the keys it applied
+        if not self.loaded or self.disk_version() != self.seen:
+            return self.load() # compacted (or first use): read everything again
+        try:
+            with open(self.log_path, 'rb') as f:
+                f.seek(self.log_pos)
+                data = f.read()
+        except (FileNotFoundError, IOError):
+            return self.load()
+        records, pos = self.read_records(data)
+        changed = {rec[1:].partition("\0")[0] for rec in records}
+        if records:
+            self.apply(records)
+            self.log_pos += pos
+            self.generation += 1
+            self.note_changes(changed)
+        self.loaded = True
+        return changed
+
+    def frame(self, text):
+        payload = bytes(custom_encrypt(text))
+        return LOG_FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+    def reset_log(self, snapshot_crc):
+        data = self.frame(f"G{snapshot_crc}")
+        self.log_pos = len(data)
+        if not self.shared:
+            return WRITER.replace(self.log_path, data)
+        atomic_write(self.log_path, data)
+
+    def append(self, text):
+        data = self.frame(text)
+        if not self.shared:
+            return WRITER.append(self.log_path, data)
+        try:
+            append_file(self.log_path, data)
+        except IOError:
+            print(f"Error: could not write {self.log_path}")
+            return False
+        self.log_pos += len(data)
+        return True
+
+    # reads are served from the in-memory index
+    def get(self, key):
+        self.ensure_loaded()
+        return self.entries.get(key)
+
+    def keys(self):
+        self.ensure_loaded()
+        return list(self.entries)
+
+    def values(self):
+        self.ensure_loaded()
+        return list(self.entries.values())
+
+    def items(self):
+        self.ensure_loaded()
+        return list(self.entries.items())
+
+    def __contains__(self, key):
+        self.ensure_loaded()
+        return key in self.entries
+
+    def __len__(self):
+        self.ensure_loaded()
+        return len(self.entries)
+
+    # writes cost one appended record
+    def put(self, key, entry):
+        with self.locked():
+            if self.entries.get(key) == entry:
+                return True
+            if not self.append(f"P{key}\0{entry}"):
+                return False
+            if key in self.entries:
+                self.garbage += 1
+            self.entries[key] = entry
+        self.maybe_compact()
+        return True
+
+    def delete(self, key):
+        with self.locked():
+            if key not in self.entries:
+                return True
+            if not self.append(f"D{key}\0"):
+                return False
+            del self.entries[key]
+            self.garbage += 2
+        self.maybe_compact()
+        return True
+
+    def maybe_compact(self):
+        # compacts in the background once most of the log is garbage
+        if self.garbage < self.min_garbage or self.garbage <= len(self.entries):
+            return
+        if self.compactor and self.compactor.is_alive():
+            return
+        self.compactor = threading.Thread(target=self.compact, daemon=True)
+        self.compactor.start()
+
+    def compact(self):
+        # rewrites the snapshot with the live entries and starts a fresh log
+        with self.locked():
+            items = list(self.entries.items())
+            if self.order:
+                items = self.order(items)
+            raw = bytes(custom_encrypt(self.sep.join(entry for _, entry in items)))
+
+            # snapshot and fresh log commit together, snapshot first
+            if self.shared:
+                atomic_write(self.path, raw)
+                self.reset_log(zlib.crc32(raw))
+                self.seen = self.disk_version()
+            else:
+                with WRITER.batch():
+                    WRITER.replace(self.path, raw)
+                    self.reset_log(zlib.crc32(raw))
+            self.garbage = 0
+
+            # rekey the way load() will read the snapshot back,
+            # or later log records would name positional keys that no longer exist
+            entries = {}
+            for i, (_, entry) in enumerate(items):
+                key = self.key_of(entry, i)
+                if key is not None:
+                    entries[key] = entry
+            if list(entries) != [k for k, _ in items]:
+                self.generation += 1
+                self.changes = None # keys were renumbered
+            self.entries = entries
+
+    def next_key(self):
+        # next free integer key, for journals without natural keys
+        self.ensure_loaded()
+        return str(max((int(k) for k in self.entries), default=-1) + 1)
+
+class ShardedJournal:
+    # one journal per shard (<name>.<i>.bin), picked by a hash of the key, so
+    # instances saving different players rarely wait on the same file lock
+    # reads and writes look like a single Journal's
+    def __init__(self, path, shards, sep, key_of, order=None, shared=False):
+        self.path = path
+        base, ext = os.path.splitext(path)
+        self.shards = [Journal(f"{base}.{i}{ext}", sep, key_of, order, shared=shared) for i in range(shards)]
+        self.legacy = Journal(path, sep, key_of, order)
+        self.shared = shared
+        self.lock = threading.RLock()
+        self.imported = False
+
+    def shard(self, key):
+        return self.shards[zlib.crc32(key.encode('utf-8')) % len(self.shards)]
+
+    def paths(self):
+        return tuple(p for j in self.shards for p in j.paths())
+
+    @property
+    def loaded(self):
+        return self.imported and all(j.loaded for j in self.shards)
+
+    @property
+    def generation(self):
+        return sum(j.generation for j in self.shards)
+
+    @property
+    def entries(self):
+        out = {}
+        for j in self.shards:
+            out.update(j.entries)
+        return out
+
+    def ensure_imported(self):
+        # first use: spreads the old single file over the shards
+        with self.lock:
+            if self.imported:
+                return
+            with ExitStack() as stack:
+                for j in self.shards: # always in shard order, so two instances can't deadlock
+                    stack.enter_context(j.lock)
+                    stack.enter_context(j.held())
+                fresh = not any(os.path.exists(p) for p in self.paths())
+                if fresh and any(os.path.exists(p) for p in self.legacy.paths()):
+                    for key, entry in self.legacy.items():
+                        self.shard(key).put(key, entry)
+            self.imported = True
+
+    @contextmanager
+    def locked(self, key=None):
+        # one shard for a key, every shard otherwise
+        self.ensure_imported()
+        with ExitStack() as stack:
+            for j in ([self.shard(key)] if key is not None else self.shards):
+                stack.enter_context(j.locked())
+            yield self
+
+    def load(self):
+        self.ensure_imported()
+        for j in self.shards:
+            j.load()
+
+    def ensure_loaded(self):
+        self.ensure_imported()
+        for j in self.shards:
+            j.ensure_loaded()
+
+    def reload(self):
+        self.ensure_imported()
+        changed = set()
+        for j in self.shards:
+            changed |= j.reload()
+        return changed
+
+    def take_changes(self):
+        changes = [j.take_changes() for j in self.shards]
+        if None in changes:
+            return None
+        return set().union(*changes)
+
+    def get(self, key):
+        self.ensure_imported()
+        return self.shard(key).get(key)
+
+    def put(self, key, entry):
+        self.ensure_imported()
+        return self.shard(key).put(key, entry)
+
+    def delete(self, key):
+        self.ensure_imported()
+        return self.shard(key).delete(key)
+
+    def keys(self):
+        self.ensure_loaded()
+        return list(self.entries)
+
+    def values(self):
+        self.ensure_loaded()
+        return list(self.entries.values())
+
+    def items(self):
+        self.ensure_loaded()
+        return list(self.entries.items())
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return sum(len(j) for j in self.shards)
+
+def session_key(entry, i):
+    parts = entry.split('|')
+    return parts[0] if len(parts) >= 4 else None
+
+def user_key(entry, i):
+    d = parse_user_str(entry)
+    return d['name'] if d and 'name' in d else None
+
+def time_key(entry, i):
+    return str(i) if len(entry.split(':')) >= 3 else None
+
+def users_order(items):
+    # snapshot keeps the leaderboard order (fastest average first)
+    return sorted(items, key=lambda kv: parse_user_str(kv[1]).get('avg_time', 0.0))
+
+def time_order(items):
+    # snapshot keeps the best scores first
+    def rank(kv):
+        try:
+            r = parse_time_record(kv[1])
+            return (-r['score'], -r['dur'], int(kv[0]))
+        except (ValueError, IndexError):
+            return (1, 0, int(kv[0]))
+    return sorted(items, key=rank)
+
+SHARED = STORAGE_MODE == "shared" and fcntl is not None
+if STORAGE_MODE == "shared" and not SHARED:
+    print("Warning: shared storage needs fcntl, using local storage")
+
+USERS = Journal(USERS_FILE, "\n", user_key, order=users_order, shared=SHARED)
+TIME_STATS = Journal(TIME_STATS_FILE, "|", time_key, order=time_order, shared=SHARED)
+if SHARED:
+    SESSIONS = ShardedJournal(SESSIONS_FILE, SHARDS, "\n", session_key, shared=True)
+    PLAYERS = ShardedJournal(PLAYERS_FILE, SHARDS, "\n", user_key, order=users_order, shared=True)
+else:
+    SESSIONS = Journal(SESSIONS_FILE, "\n", session_key)
+    PLAYERS = Journal(PLAYERS_FILE, "\n", user_key, order=users_order)
+
+# time attack stats management
+def parse_time_record(entry):
+    segments = entry.split(':')
+    return {'dur': int(segments[0]), 'score': int(segments[1]), 'name': segments[2]}
+
+TIME_BOARD = None
+TIME_BOARD_GEN = None   # journal generation the board's seqs belong to
+
+def time_board():
+    # the journal parsed once into a TimeAttackBoard, then kept in step by save_time_score
+    # (rebuilt only if the journal renumbered its keys)
+    global TIME_BOARD, TIME_BOARD_GEN
+    with TIME_STATS.lock:
+        TIME_STATS.ensure_loaded()
+        if TIME_BOARD is None or TIME_BOARD_GEN != TIME_STATS.generation:
+            board = TimeAttackBoard(capacity=20)
+            for key, entry in TIME_STATS.items():
+                try:
+                    r = parse_time_record(entry)
+                    board.add(int(key), r['dur'], r['score'], r['name'])
+                except (ValueError, IndexError):
+                    print(f"Skipping corrupt stat: {entry}")
+            TIME_BOARD, TIME_BOARD_GEN = board, TIME_STATS.generation
+        return TIME_BOARD
 
 # user and session management
 def parse_user_str(line):
@@ -209,107 +1108,405 @@ def parse_user_str(line):
             
     return d
 
-def save_users(ll):
-    # saves linked list of users to encrypted file
-    lines = []
-    curr = ll.head
-    while curr:
-        d = curr.data
-        line = (f"name:{d['name']}|avg_time:{d['avg_time']}|games:{d['games']}|"
-                f"total_time:{d['total_time']}|word:{d.get('last_word', 'N/A')}|"
-                f"guesses:{d.get('last_guesses', '')}")
-        lines.append(line)
-        curr = curr.next
-        
+def format_user(d):
+    return (f"name:{d['name']}|avg_time:{d['avg_time']}|games:{d['games']}|"
+            f"total_time:{d['total_time']}|word:{d.get('last_word', 'N/A')}|"
+            f"guesses:{d.get('last_guesses', '')}")
+
+# resume slots: how many unfinished games are kept (None = unlimited)
+# saving a new one when full evicts the least recently played
+SESSION_CAPACITY = 5
+
+def parse_session(line):
+    # name|target|guesses|category[|last played]
+    parts = line.split('|')
     try:
-        with open(USERS_FILE, 'wb') as f: 
-            f.write(custom_encrypt("\n".join(lines)))
-    except IOError:
-        print("Error: Could not save match history to users.bin")
+        played = float(parts[4]) if len(parts) > 4 else 0.0
+    except ValueError:
+        played = 0.0
+    return {"target": parts[1], "guesses": parts[2].split(',') if parts[2] else [], "category": parts[3], "played": played}
+
+class SessionStore:
+    # name -> session index over the sessions journal
+    # reloaded only when the files change under it, e.g. another copy of the game saved
+    def __init__(self, journal=SESSIONS, capacity=SESSION_CAPACITY):
+        self.journal = journal
+        self.capacity = capacity
+        self.stamp = None
+        self.sessions = {}  # name -> parsed session, in file order
+        # saves still queued on the save thread; until they land, reads come from
+        # shadow, the index as it will be once they have
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.shadow = {}
+
+    def disk_stamp(self):
+        stamp = []
+        for path in self.journal.paths():
+            try:
+                st = os.stat(path)
+                stamp.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def refresh(self):
+        stamp = self.disk_stamp()
+        if stamp != self.stamp:
+            if self.stamp is not None or not self.journal.loaded:
+                self.journal.reload()
+            self.index()
+            self.stamp = self.disk_stamp()
+        return self
+
+    def index(self):
+        self.sessions = {name: parse_session(line) for name, line in self.journal.entries.items()}
+
+    def synced(self):
+        # our own write moved the files; no need to read them back
+        self.stamp = self.disk_stamp()
+
+    def names(self):
+        if self.pending:
+            return list(self.shadow)
+        return list(self.refresh().sessions)
+
+    def get(self, name):
+        if self.pending:
+            return self.shadow.get(name)
+        return self.refresh().sessions.get(name)
+
+    def line(self, name, state):
+        played = time.time()
+        guesses_str = ",".join(state['guesses'])
+        return f"{name}|{state['target']}|{guesses_str}|{state['category']}|{played:.3f}"
+
+    def evicted(self, sessions, name):
+        # sessions to drop, least recently played first, to make room for a new name
+        if name in sessions or self.capacity is None:
+            return []
+        extra = len(sessions) - self.capacity + 1
+        return sorted(sessions, key=lambda n: sessions[n]['played'])[:max(0, extra)]
+
+    def put(self, name, state):
+        return self.write(name, self.line(name, state))
+
+    def put_later(self, name, state):
+        # the index (and so the resume list) has the session at once; the file
+        # write runs on the save thread
+        line = self.line(name, state)
+        shadow = dict(self.shadow if self.pending else self.refresh().sessions)
+        for old in self.evicted(shadow, name):
+            del shadow[old]
+        shadow[name] = parse_session(line)
+        self.shadow = shadow
+        with self.lock:
+            self.pending += 1
+        return PERSIST.submit(self.write_later, name, line)
+
+    def write_later(self, name, line):
+        try:
+            return self.write(name, line)
+        finally:
+            with self.lock:
+                self.pending -= 1
+
+    def write(self, name, line):
+        # a new name may evict someone else's session, so it locks every shard
+        evicting = name not in self.refresh().sessions and self.capacity is not None
+        with self.journal.locked(None if evicting else name):
+            self.index() # the lock just caught up on every shard we may touch
+            for old in self.evicted(self.sessions, name):
+                self.remove(old)
+
+            if not self.journal.put(name, line):
+                return False
+            self.sessions[name] = parse_session(line)
+            self.synced()
+        return True
+
+    def remove(self, name):
+        with self.journal.locked(name):
+            self.index()
+            if not self.journal.delete(name):
+                return False
+            self.sessions.pop(name, None)
+            self.synced()
+        return True
+
+STORE = SessionStore()
+
+# player stats: every player's aggregates, unbounded
+# users.bin keeps holding only the top-20 view for the leaderboard screen
+class PlayerStats:
+    def __init__(self, journal=PLAYERS, view_size=20):
+        self.journal = journal
+        self.view_size = view_size
+        self.board = Leaderboard(capacity=None)
+        self.view = []
+
+    def rebuild(self):
+        self.journal.ensure_loaded()
+        self.journal.take_changes() # the board starts from everything loaded so far
+        self.board = Leaderboard(capacity=None)
+        self.board.extend(d for d in map(parse_user_str, self.journal.values()) if d)
+        self.view = self.board.top(self.view_size)
+
+    def load(self):
+        self.rebuild()
+
+        # first run: seed from the top-20 file
+        if not len(self.board):
+            for d in FLAT.load_users().to_list():
+                self.board.add_sorted(d)
+                self.journal.put(d['name'], format_user(d))
+        self.view = self.board.top(self.view_size)
+        return self
+
+    def catch_up(self):
+        # folds in only the players whose entries changed under us (other instances' wins)
+        changed = self.journal.take_changes()
+        if changed is None:
+            return self.rebuild()
+        if not changed:
+            return
+        for name in changed:
+            entry = self.journal.get(name)
+            d = parse_user_str(entry) if entry is not None else None
+            if d:
+                self.board.add_sorted(d)
+            else:
+                self.board.remove_user(name)
+        self.view = self.board.top(self.view_size)
+
+    def refresh(self):
+        # shared mode: picks up wins other instances recorded
+        if self.journal.shared:
+            self.journal.reload()
+            self.catch_up()
+        return self
+
+    def __len__(self):
+        return len(self.board)
+
+    def find_user(self, name):
+        return self.board.find_user(name)
+
+    def to_list(self):
+        # cached top-20 view
+        return self.view
+
+    def record_win(self, name, play_time, word='N/A', guesses=''):
+        # folds one win into the player's aggregates and refreshes the view if needed
+        self.journal.ensure_loaded() # no shard loads while holding another's lock
+        with self.journal.locked(name):
+            # another instance may have recorded wins since; fold into its numbers, not ours
+            self.catch_up()
+            old = self.board.find_user(name)
+            old_rank = self.board.rank(name)
+            if old:
+                total = float(old['total_time']) + float(play_time)
+                games = int(old['games']) + 1
+            else:
+                total, games = float(play_time), 1
+            d = {'name': name, 'avg_time': total / games, 'games': games, 'total_time': total,
+                 'last_word': word, 'last_guesses': guesses}
+
+            self.board.add_sorted(d)
+            self.journal.put(name, format_user(d))
+
+        # only a change inside the top-20 touches the view
+        in_view = lambda rank: rank is not None and rank < self.view_size
+        if in_view(old_rank) or in_view(self.board.rank(name)):
+            self.view = self.board.top(self.view_size)
+            top = Leaderboard()
+            top.extend(self.view)
+            FLAT.save_users(top)
+        return d
+
+# storage backends
+# a backend stores users, sessions and time attack scores behind the functions below;
+# the journal files above are the default, WORDLE_BACKEND=sqlite selects
+# sqlite_backend.SQLiteBackend (run "python sqlite_backend.py migrate" to copy the files over)
+class FlatFileBackend:
+    def batch(self):
+        return WRITER.batch()
+
+    def save_time_score(self, duration, score, username):
+        # saves a new time attack score and trims to top 20
+        ensure_data_dir()
+        with TIME_STATS.locked(): # a compaction (or another instance) must not renumber keys halfway through
+            board = time_board()
+            key = TIME_STATS.next_key()
+            if not TIME_STATS.put(key, f"{duration}:{score}:{username}"):
+                print("Error saving Time Attack leaderboard.")
+                return
+            board.add(int(key), int(duration), score, username)
+
+            # drop everything below the top 20
+            for seq in board.overflow():
+                TIME_STATS.delete(str(seq))
+                board.remove(seq)
+
+    def refresh_time_stats(self):
+        # shared mode: picks up scores other instances saved
+        if TIME_STATS.shared:
+            TIME_STATS.reload()
+
+    def load_time_stats_list(self):
+        # sorted list of dictionaries for the leaderboard UI (cached, do not modify)
+        return time_board().to_list()
+
+    def load_time_stats(self):
+        # returns time stats as a dict for quick lookup
+        return {dur: {'score': r['score'], 'name': r['name']} for dur, r in time_board().best().items()}
+
+    def save_users(self, ll):
+        # journals only the users that changed since the last save
+        current = {d['name']: format_user(d) for d in ll.to_list()}
+
+        ok = True
+        with USERS.locked():
+            for name in USERS.keys():
+                if name not in current:
+                    ok = USERS.delete(name) and ok
+            for name, line in current.items():
+                ok = USERS.put(name, line) and ok
+        if not ok:
+            print("Error: Could not save match history to users.bin")
+
+    def load_users(self):
+        ll = Leaderboard()
+        ll.extend(d for d in map(parse_user_str, USERS.values()) if d)
+        return ll
+
+    def get_session_users(self):
+        return STORE.names()
+
+    def save_session(self, username, state):
+        # saves or updates player's session, evicting the least recently played when full
+        ensure_data_dir()
+        return STORE.put(username, state)
+
+    def save_session_later(self, username, state):
+        ensure_data_dir()
+        return STORE.put_later(username, state)
+
+    def delete_session(self, username):
+        # removes a user's session from the file after they finish a game
+        if not STORE.remove(username):
+            print(f"Error clearing session for {username}")
+
+    def load_session(self, username):
+        # loads a user's session from the index
+        data = STORE.get(username)
+        if data is None: return None
+        return {"target": data['target'], "guesses": list(data['guesses']), "category": data['category']}
+
+    def load_player_stats(self):
+        return PlayerStats().load()
+
+FLAT = FlatFileBackend()
+BACKEND_NAME = os.environ.get("WORDLE_BACKEND", "flat")
+BACKEND = None
+
+# background saves
+# the game hands slow writes to one worker thread and keeps drawing; the worker runs
+# them in submission order, so saves to the same file land in the order they were made
+class PersistWorker:
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def submit(self, fn, *args):
+        # returns a Future for callers that want to know the save landed
+        future = Future()
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+            self.queue.put((future, fn, args))
+        return future
+
+    def run(self):
+        while True:
+            future, fn, args = self.queue.get()
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(*args))
+                    except Exception as e:
+                        print(f"Error: background save failed: {e}")
+                        future.set_exception(e)
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        # waits for everything submitted so far (a no-op on the worker itself)
+        if self.thread is not None and threading.current_thread() is not self.thread:
+            self.queue.join()
+
+PERSIST = PersistWorker()
+atexit.register(PERSIST.flush) # runs before WRITER.flush (atexit is last in, first out)
+
+def persist(fn, *args):
+    # fn(*args) on the save thread, e.g. persist(save_session, name, state)
+    return PERSIST.submit(fn, *args)
+
+def get_backend():
+    global BACKEND
+    if BACKEND is None:
+        if BACKEND_NAME == "sqlite":
+            from sqlite_backend import SQLiteBackend
+            BACKEND = SQLiteBackend()
+        else:
+            BACKEND = FLAT
+    return BACKEND
+
+def settled():
+    # waits for queued saves, so reads see them and direct writes stay in order;
+    # sessions skip this, their index already has the queued ones
+    PERSIST.flush()
+    return get_backend()
+
+def write_batch():
+    # groups several saves into a single commit
+    return settled().batch()
+
+def save_time_score(duration, score, username):
+    return settled().save_time_score(duration, score, username)
+
+def refresh_time_stats():
+    return settled().refresh_time_stats()
+
+def load_time_stats_list():
+    return settled().load_time_stats_list()
+
+def load_time_stats():
+    return settled().load_time_stats()
+
+def save_users(ll):
+    return settled().save_users(ll)
 
 def load_users():
-    ll = LinkedList()
-    try:
-        with open(USERS_FILE, 'rb') as f:
-            content = custom_decrypt(f.read())
-        for line in content.split('\n'):
-            if line:
-                d = parse_user_str(line)
-                if d: ll.add_sorted(d)
-    except FileNotFoundError: pass
-    return ll
+    return settled().load_users()
 
 def get_session_users():
-    users = []
-    try:
-        with open(SESSIONS_FILE, 'rb') as f:
-            content = custom_decrypt(f.read())
-            for line in content.split('\n'):
-                parts = line.split('|')
-                if len(parts) >= 1 and parts[0]: users.append(parts[0])
-    except: pass
-    return users
-
-def save_session(username, state, overwrite_target=None):
-    # saves or updates player's session in the file
-    ensure_data_dir()
-    all_sessions = {}
-    try:
-        with open(SESSIONS_FILE, 'rb') as f:
-            content = custom_decrypt(f.read())
-            for line in content.split('\n'):
-                parts = line.split('|')
-                if len(parts) >= 4: all_sessions[parts[0]] = line
-    except: pass
-
-    if username not in all_sessions and len(all_sessions) >= 5 and overwrite_target is None:
-        return False
-
-    if overwrite_target and overwrite_target in all_sessions:
-        del all_sessions[overwrite_target]
-
-    guesses_str = ",".join(state['guesses'])
-    new_line = f"{username}|{state['target']}|{guesses_str}|{state['category']}"
-    all_sessions[username] = new_line
-    
-    try:
-        with open(SESSIONS_FILE, 'wb') as f:
-            f.write(custom_encrypt("\n".join(all_sessions.values())))
-        return True
-    except: return False
+    return get_backend().get_session_users()
+
+def save_session(username, state):
+    return settled().save_session(username, state)
+
+def save_session_later(username, state):
+    # queues the save; the resume list shows it straight away
+    return get_backend().save_session_later(username, state)
 
 def delete_session(username):
-    # removes a user's session from the file after they finish a game
-    all_sessions = {}
-    try:
-        with open(SESSIONS_FILE, 'rb') as f:
-            content = custom_decrypt(f.read())
-            for line in content.split('\n'):
-                parts = line.split('|')
-                if len(parts) >= 4:
-                    all_sessions[parts[0]] = line
-    except:
-        return
-
-    if username in all_sessions:
-        del all_sessions[username]
-        
-        # write back the remaining sessions
-        full_text = "\n".join(all_sessions.values())
-        try:
-            with open(SESSIONS_FILE, 'wb') as f:
-                f.write(custom_encrypt(full_text))
-        except IOError:
-            print(f"Error clearing session for {username}")
+    return settled().delete_session(username)
 
 def load_session(username):
-    # loads a user's session from the file
-    try:
-        with open(SESSIONS_FILE, 'rb') as f:
-            content = custom_decrypt(f.read())
-        for line in content.split('\n'):
-            parts = line.split('|')
-            if len(parts) >= 4 and parts[0] == username:
-                return {"target": parts[1], "guesses": parts[2].split(',') if parts[2] else [], "category": parts[3]}
-    except: pass
-    return None
\ No newline at end of file
+    return get_backend().load_session(username)
+
+def load_player_stats():
+    return settled().load_player_stats()
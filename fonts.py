@@ -0,0 +1,57 @@
+import pygame
+from collections import OrderedDict
+from settings import FONT_NAME
+
+# font objects, memoized by (name, size, bold)
+FONT_CACHE = {}
+
+# rendered text surfaces, LRU keyed by (text, size, color, bold, name)
+TEXT_CACHE = OrderedDict()
+TEXT_CACHE_LIMIT = 512              # max number of surfaces
+TEXT_CACHE_BYTES = 8 * 1024 * 1024  # max pixel memory held by the cache
+
+cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'bytes': 0}
+
+def get_font(size, bold=False, name=FONT_NAME):
+    # system font lookup happens once per (name, size, bold)
+    key = (name, size, bold)
+    font = FONT_CACHE.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size, bold=bold)
+        FONT_CACHE[key] = font
+    return font
+
+def surface_bytes(surf):
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+def render_text(text, size, color, bold=False, name=FONT_NAME):
+    # returns a cached antialiased text surface (do not draw onto it)
+    key = (text, size, tuple(color), bold, name)
+    surf = TEXT_CACHE.get(key)
+    if surf is not None:
+        TEXT_CACHE.move_to_end(key)
+        cache_stats['hits'] += 1
+        return surf
+
+    cache_stats['misses'] += 1
+    surf = get_font(size, bold, name).render(text, True, color)
+    TEXT_CACHE[key] = surf
+    cache_stats['bytes'] += surface_bytes(surf)
+
+    # evict least recently used surfaces until both limits hold
+    while len(TEXT_CACHE) > 1 and (len(TEXT_CACHE) > TEXT_CACHE_LIMIT or cache_stats['bytes'] > TEXT_CACHE_BYTES):
+        _, old = TEXT_CACHE.popitem(last=False)
+        cache_stats['bytes'] -= surface_bytes(old)
+        cache_stats['evictions'] += 1
+    return surf
+
+def clear_text_cache():
+    TEXT_CACHE.clear()
+    cache_stats['bytes'] = 0
+
+def cache_info():
+    # snapshot of the text cache counters
+    info = dict(cache_stats)
+    info['size'] = len(TEXT_CACHE)
+    info['fonts'] = len(FONT_CACHE)
+    return info
@@ -2,157 +2,213 @@ import pygame
 import time
 from settings import *
 from logic import check_guess
-from structures import Stack
-from file_system import save_session, save_time_score, get_random_mix
+from engine import GameEngine, TimeAttackEngine
+from file_system import persist, save_session_later, save_time_score
+from fonts import render_text
+from rendering import DirtyFrame, EventPump
+from hints import prepare, suggest
 
 def draw_text(screen, text, size, color, center_pos, bold=False):
     # handle text rendering
-    font = pygame.font.SysFont(FONT_NAME, size, bold=bold)
-    surf = font.render(text, True, color)
+    surf = render_text(text, size, color, bold)
     screen.blit(surf, surf.get_rect(center=center_pos))
 
-def draw_keyboard(screen, guesses, target_word):
+# guess grid consts
+BOX_SIZE, GAP = 48, 5
+GRID_W = (BOX_SIZE * 5) + (GAP * 4)
+
+# rendered rows of submitted guesses, keyed by (guess, target, theme)
+ROW_CACHE = {}
+ROW_CACHE_LIMIT = 256
+
+def render_row(guess, target):
+    # renders a submitted guess row once into an off-screen surface
+    theme = (GREEN, YELLOW, GRAY, WHITE, BOX_SIZE, GAP, FONT_NAME)
+    key = (guess, target, theme)
+    surf = ROW_CACHE.get(key)
+    if surf is not None:
+        return surf
+
+    surf = pygame.Surface((GRID_W, BOX_SIZE), pygame.SRCALPHA)
+    res = check_guess(guess, target)
+    for col in range(5):
+        rect = pygame.Rect(col * (BOX_SIZE + GAP), 0, BOX_SIZE, BOX_SIZE)
+        if res[col] == 2: color = GREEN
+        elif res[col] == 1: color = YELLOW
+        else: color = GRAY
+        pygame.draw.rect(surf, color, rect, border_radius=BORDER_RADIUS)
+        draw_text(surf, guess[col], 26, WHITE, rect.center, True)
+
+    # rows are tiny, so simply start over when the cache fills up
+    if len(ROW_CACHE) >= ROW_CACHE_LIMIT:
+        ROW_CACHE.clear()
+    ROW_CACHE[key] = surf
+    return surf
+
+# screen area covered by the on-screen keyboard
+KEYBOARD_AREA = pygame.Rect(0, HEIGHT - 165, WIDTH, 145)
+
+# qwerty keyboard layout
+KEY_ROWS = ["QWERTYUIOP", "ASDFGHJKL", "ZXCVBNM"]
+KEY_W, KEY_H, KEY_GAP = 35, 45, 5
+
+# rendered key caps, keyed by (letter, status, theme)
+KEY_CACHE = {}
+
+def render_key(char, status):
+    # renders one key cap once per status it ever shows
+    theme = (GREEN, YELLOW, GRAY, ACCENT_COLOR, WHITE, TEXT_COLOR, FONT_NAME)
+    key = (char, status, theme)
+    surf = KEY_CACHE.get(key)
+    if surf is None:
+        surf = pygame.Surface((KEY_W, KEY_H), pygame.SRCALPHA)
+        rect = surf.get_rect()
+        if status == 2: bg = GREEN
+        elif status == 1: bg = YELLOW
+        elif status == 0: bg = GRAY
+        else: bg = ACCENT_COLOR
+        pygame.draw.rect(surf, bg, rect, border_radius=5)
+        text_col = WHITE if status != -1 else TEXT_COLOR
+        draw_text(surf, char, 20, text_col, rect.center, True)
+        KEY_CACHE[key] = surf
+    return surf
+
+class KeyboardState:
+    # on-screen keyboard for the letter statuses tracked by the game engine
+    # 2:Green, 1:Yellow, 0:Gray, missing: not guessed yet
+    def __init__(self, letters=None):
+        self.status = dict(letters or {})
+        self.surface = None # whole keyboard, rebuilt only after a status change
+
+    def restore(self, letters):
+        if letters != self.status:
+            self.status = dict(letters)
+            self.surface = None
+
+    def render(self):
+        if self.surface is None:
+            self.surface = pygame.Surface(KEYBOARD_AREA.size, pygame.SRCALPHA)
+            for r, row_keys in enumerate(KEY_ROWS):
+                row_width = len(row_keys) * (KEY_W + KEY_GAP) - KEY_GAP
+                start_x = (WIDTH - row_width) // 2
+                for c, char in enumerate(row_keys):
+                    pos = (start_x + c * (KEY_W + KEY_GAP), r * (KEY_H + KEY_GAP))
+                    self.surface.blit(render_key(char, self.status.get(char, -1)), pos)
+        return self.surface
+
+def draw_keyboard(screen, keys):
     # draws togglable keyboard to keep track of letter statuses
-    key_status = {}
-
-    # determine status of each letter based on guesses
-    for word in guesses:
-        res = check_guess(word, target_word)
-        for i, char in enumerate(word):
-            status = res[i]
-            if char not in key_status: 
-                key_status[char] = status
-            else: 
-                key_status[char] = max(key_status[char], status)
-
-    rows = ["QWERTYUIOP", "ASDFGHJKL", "ZXCVBNM"] #qwerty keyboard
-    key_w, key_h = 35, 45
-    gap = 5
-    total_h = (len(rows) * key_h) + ((len(rows)-1) * gap)
-    start_y = HEIGHT - total_h - 20 
-
-    # draw keyboard
-    for r, row_keys in enumerate(rows):
-        row_width = len(row_keys) * (key_w + gap) - gap
-        start_x = (WIDTH - row_width) // 2
-        for c, char in enumerate(row_keys):
-            x = start_x + c * (key_w + gap)
-            y = start_y + r * (key_h + gap)
-            rect = pygame.Rect(x, y, key_w, key_h)
-            status = key_status.get(char, -1)
-            
-            if status == 2: bg = GREEN
-            elif status == 1: bg = YELLOW
-            elif status == 0: bg = GRAY
-            else: bg = ACCENT_COLOR
-            
-            pygame.draw.rect(screen, bg, rect, border_radius=5)
-            text_col = WHITE if status != -1 else TEXT_COLOR
-            draw_text(screen, char, 20, text_col, rect.center, True)
+    screen.blit(keys.render(), KEYBOARD_AREA.topleft)
 
-def play_game(screen, category, target_word, max_guesses, user_name, initial_guesses=[], overwrite_func=None):
+def play_game(screen, category, target_word, max_guesses, user_name, initial_guesses=[]):
 
     # initialize game state
-    clock = pygame.time.Clock()
-    undo_stack = Stack()
-    redo_stack = Stack()
-    
-    guesses = initial_guesses[:]
+    events = EventPump()
+    game = GameEngine(target_word, max_guesses, initial_guesses, undo_limit=UNDO_LIMIT)
+    prepare(category) # hint engine builds in the background while the player starts
+    keys = KeyboardState(game.letters)
+    guesses = game.guesses
     current_guess = ""
-    start_time = time.time()
     game_over = False
     result_data = None 
-    message = "Undo: '[' | Redo: ']'"
+    message = "Undo: '[' | Redo: ']' | Hint: TAB"
     
     show_keyboard = True 
 
-    # UI consts
-    BOX_SIZE, GAP = 48, 5 
+    # cached surfaces of submitted rows, rebuilt on submit/undo/redo
+    row_surfs = None
+    
+    # screen regions tracked for dirty-rect redraws
+    frame = DirtyFrame()
+    toggle_btn_rect = pygame.Rect(WIDTH - 100, 15, 90, 28)
+    msg_area = pygame.Rect(0, 50, WIDTH, 30)
+    grid_area = pygame.Rect((WIDTH - GRID_W) // 2, 90, GRID_W, (BOX_SIZE * max_guesses) + (GAP * (max_guesses-1)))
+    footer_area = pygame.Rect(0, 405, WIDTH, 28)
     
     running = True
     while running:
-        screen.fill(BG_COLOR)
         mouse_pos = pygame.mouse.get_pos()
+        frame.mark("toggle", toggle_btn_rect, (toggle_btn_rect.collidepoint(mouse_pos), show_keyboard))
+        frame.mark("message", msg_area, (message, game_over))
+        frame.mark("grid", grid_area, (guesses, current_guess, game_over))
+        frame.mark("keyboard", KEYBOARD_AREA, (show_keyboard, guesses))
+        frame.mark("footer", footer_area, game_over)
+
+        if frame.needs_redraw():
+            screen.fill(BG_COLOR)
         
-        # header
-        title_text = "WORDLE" if category == "WORDLE" else category
-        draw_text(screen, title_text, 28, TEXT_COLOR, (WIDTH//2, 40), True)
+            # header
+            title_text = "WORDLE" if category == "WORDLE" else category
+            draw_text(screen, title_text, 28, TEXT_COLOR, (WIDTH//2, 40), True)
         
-        # keyboard toggle button
-        toggle_btn_rect = pygame.Rect(WIDTH - 100, 15, 90, 28)
-        btn_color = BUTTON_HOVER if toggle_btn_rect.collidepoint(mouse_pos) else ACCENT_COLOR
-        pygame.draw.rect(screen, btn_color, toggle_btn_rect, border_radius=5)
-        btn_text = "HIDE KEY" if show_keyboard else "SHOW KEY"
-        draw_text(screen, btn_text, 14, WHITE, toggle_btn_rect.center, True)
+            # keyboard toggle button
+            btn_color = BUTTON_HOVER if toggle_btn_rect.collidepoint(mouse_pos) else ACCENT_COLOR
+            pygame.draw.rect(screen, btn_color, toggle_btn_rect, border_radius=5)
+            btn_text = "HIDE KEY" if show_keyboard else "SHOW KEY"
+            draw_text(screen, btn_text, 14, WHITE, toggle_btn_rect.center, True)
         
-        # win/lose message
-        msg_color = GRAY
-        if game_over:
-            msg_color = GREEN if result_data['res'] == "WIN" else RED
-        draw_text(screen, message, 16, msg_color, (WIDTH//2, 65))
-
-        # guess grid
-        grid_h = (BOX_SIZE * max_guesses) + (GAP * (max_guesses-1))
-        start_y = 90
+            # win/lose message
+            msg_color = GRAY
+            if game_over:
+                msg_color = GREEN if result_data['res'] == "WIN" else RED
+            draw_text(screen, message, 16, msg_color, (WIDTH//2, 65))
+
+            # guess grid
+            start_y = 90
         
-        for row in range(max_guesses):
-            for col in range(5):
-                total_grid_w = (BOX_SIZE * 5) + (GAP * 4)
-                start_x = (WIDTH - total_grid_w) // 2
-                
-                x = start_x + col * (BOX_SIZE + GAP)
-                y = start_y + row * (BOX_SIZE + GAP)
-                rect = pygame.Rect(x, y, BOX_SIZE, BOX_SIZE)
-                
-                color, text_col, style, letter = ACCENT_COLOR, TEXT_COLOR, "border", ""
+            start_x = (WIDTH - GRID_W) // 2
+            if row_surfs is None:
+                row_surfs = [render_row(g, target_word) for g in guesses]
+        
+            for row in range(max_guesses):
 
-                # fill in past guesses
+                # past guesses are blitted from the row cache
                 if row < len(guesses):
-                    past = guesses[row]
-                    letter = past[col]
-                    res = check_guess(past, target_word)
-                    if res[col] == 2: color = GREEN
-                    elif res[col] == 1: color = YELLOW
-                    else: color = GRAY
-                    style, text_col = "fill", WHITE
+                    screen.blit(row_surfs[row], (start_x, start_y + row * (BOX_SIZE + GAP)))
+                    continue
+
+                for col in range(5):
+                    x = start_x + col * (BOX_SIZE + GAP)
+                    y = start_y + row * (BOX_SIZE + GAP)
+                    rect = pygame.Rect(x, y, BOX_SIZE, BOX_SIZE)
                 
-                # current guess
-                elif row == len(guesses) and not game_over:
-                    if col < len(current_guess):
-                        letter, color = current_guess[col], (100, 100, 100)
-                    if col == len(current_guess): color = BLACK 
+                    color, text_col, style, letter = ACCENT_COLOR, TEXT_COLOR, "border", ""
+
+                    # current guess
+                    if row == len(guesses) and not game_over:
+                        if col < len(current_guess):
+                            letter, color = current_guess[col], (100, 100, 100)
+                        if col == len(current_guess): color = BLACK 
                 
-                if style == "fill": 
-                    pygame.draw.rect(screen, color, rect, border_radius=BORDER_RADIUS)
-                else: 
-                    pygame.draw.rect(screen, color, rect, width=2, border_radius=BORDER_RADIUS)
+                    if style == "fill": 
+                        pygame.draw.rect(screen, color, rect, border_radius=BORDER_RADIUS)
+                    else: 
+                        pygame.draw.rect(screen, color, rect, width=2, border_radius=BORDER_RADIUS)
                 
-                if letter: 
-                    draw_text(screen, letter, 26, text_col, rect.center, True)
+                    if letter: 
+                        draw_text(screen, letter, 26, text_col, rect.center, True)
 
-        # keyboard
-        if show_keyboard:
-            draw_keyboard(screen, guesses, target_word)
+            # keyboard
+            if show_keyboard:
+                draw_keyboard(screen, keys)
 
-        # guide the player to continue after game over
-        if game_over:
-            draw_text(screen, "Press ENTER to Continue", 16, TEXT_COLOR, (WIDTH//2, 418), True)
-        pygame.display.flip()
+            # guide the player to continue after game over
+            if game_over:
+                draw_text(screen, "Press ENTER to Continue", 16, TEXT_COLOR, (WIDTH//2, 418), True)
+            frame.present()
 
-        # event handling
-        for event in pygame.event.get():
+        # event handling (nothing animates here, so just wait for input)
+        for event in events.wait():
 
             # quit event
             if event.type == pygame.QUIT:
 
                 # save session in "resume" if game not over
+                # (a full "resume" tab drops its least recently played game)
+                # (saved in the background; the exit hook waits for it)
                 if not game_over:
-                    state = {"guesses":guesses, "target":target_word, "category":category}
-                    success = save_session(user_name, state)
-                    if not success and overwrite_func:
-                        victim = overwrite_func()
-                        if victim: 
-                            save_session(user_name, state, overwrite_target=victim)
+                    state = {"guesses":list(guesses), "target":target_word, "category":category}
+                    save_session_later(user_name, state)
 
                 return "QUIT"
             
@@ -172,116 +228,98 @@ def play_game(screen, category, target_word, max_guesses, user_name, initial_gue
                 # handle regular gameplay
                 else:
                     if event.key == pygame.K_ESCAPE:
-                        state = {"guesses":guesses, "target":target_word, "category":category}
-                        success = save_session(user_name, state)
-
-                        # overwrite account in "resume" if needed
-                        if not success and overwrite_func:
-                            victim = overwrite_func()
-                            if victim: save_session(user_name, state, overwrite_target=victim)
+                        state = {"guesses":list(guesses), "target":target_word, "category":category}
+                        save_session_later(user_name, state)
                         return "MENU"
                     
                     # undo guesses
                     if event.key == pygame.K_LEFTBRACKET:
-                        if not undo_stack.is_empty():
-                            # save current state to Redo before undoing
-                            redo_stack.push(guesses[:])
-                            guesses = undo_stack.pop()
+                        if game.undo():
+                            guesses = game.guesses
+                            keys.restore(game.letters)
+                            row_surfs = None
                             current_guess = ""
                             message = "Undone!"
 
                     # redo guesses
                     elif event.key == pygame.K_RIGHTBRACKET:
-                        if not redo_stack.is_empty():
-                            # save current state back to Undo before redoing
-                            undo_stack.push(guesses[:])
-                            guesses = redo_stack.pop()
+                        if game.redo():
+                            guesses = game.guesses
+                            keys.restore(game.letters)
+                            row_surfs = None
                             current_guess = ""
                             message = "Redone!"
 
+                    # best next guess from the remaining candidates
+                    elif event.key == pygame.K_TAB:
+                        hint = suggest(guesses, target_word, category)
+                        if hint:
+                            message = f"Hint: {hint}"
+                        elif prepare(category) is None:
+                            message = "Hints are still loading..."
+                        else:
+                            message = "No hint available"
+
                     # backspace to delete last letter
                     elif event.key == pygame.K_BACKSPACE: 
                         current_guess = current_guess[:-1]
 
                     # enter key to submit guess
                     elif event.key == pygame.K_RETURN:
-                        if len(current_guess) == 5:
-                            undo_stack.push(guesses[:])
-                            guesses.append(current_guess)
+                        outcome = game.submit(current_guess)
+                        if outcome == "SHORT":
+                            message = "Not enough letters"
+                        else:
+                            guesses = game.guesses
+                            keys.restore(game.letters)
+                            row_surfs = None
                             current_guess = ""
-                            if guesses[-1] == target_word:
-                                message = "VICTORY!"; game_over = True
-                                # save 'target' and 'guesses' in result_data for leaderboard history view
-                                result_data = {
-                                    "res": "WIN", 
-                                    "time": time.time()-start_time,
-                                    "target": target_word,
-                                    "guesses": guesses[:]
-                                }
-                            elif len(guesses) >= max_guesses:
-                                message = f"GAME OVER! Word: {target_word}"; game_over = True
-                                # save 'target' and 'guesses' in result_data for leaderboard history view
-                                result_data = {
-                                    "res": "LOSE", 
-                                    "time": time.time()-start_time,
-                                    "target": target_word,
-                                    "guesses": guesses[:]
-                                }
-                        else: message = "Not enough letters"
+                            if outcome == "WIN":
+                                message = "VICTORY!"
+                            elif outcome == "LOSE":
+                                message = f"GAME OVER! Word: {target_word}"
+                            # result_data keeps 'target' and 'guesses' for leaderboard history view
+                            result_data = game.result
+                            game_over = game.over
                     elif len(current_guess) < 5 and event.unicode.isalpha():
                         current_guess += event.unicode.upper()
 
-        clock.tick(FPS)
-
 # time attack gamemode
 def play_time_attack(screen, duration, user_name):
 
     # initialize game state
-    clock = pygame.time.Clock()
-    start_time = time.time()
-    score = 0
-    time_up = False
+    events = EventPump()
+    game = TimeAttackEngine(duration)
+    current_guess = ""
     
     animating = False
     anim_start_time = 0
     anim_duration = 0.5
-    last_snapshot = None
     announcement = ""
 
     show_keyboard = True 
 
-    # UI consts
-    BOX_SIZE, GAP = 48, 5 
-
-    # configure new round
-    def new_round():
-        c, w, d = get_random_mix()
-        return c, w, d, [], ""
-
     # draw guess grid
     def draw_grid_at_y(surf, start_y, g_list, curr, target, max_g, cat_hint):
         draw_text(surf, f"Category: {cat_hint}", 14, GRAY, (WIDTH//2, start_y - 40))
         
+        start_x = (WIDTH - GRID_W) // 2
+
         for row in range(max_g):
+
+            # past guesses come from the row cache
+            if row < len(g_list):
+                surf.blit(render_row(g_list[row], target), (start_x, start_y + row * (BOX_SIZE + GAP) - 20))
+                continue
+
             for col in range(5):
-                total_grid_w = (BOX_SIZE * 5) + (GAP * 4)
-                start_x = (WIDTH - total_grid_w) // 2
-                
                 x = start_x + col * (BOX_SIZE + GAP)
                 y = start_y + row * (BOX_SIZE + GAP) - 20
                 rect = pygame.Rect(x, y, BOX_SIZE, BOX_SIZE)
                 color, text_col, style, letter = ACCENT_COLOR, TEXT_COLOR, "border", ""
 
-                # fill in past guesses
-                if row < len(g_list): 
-                    past = g_list[row]; letter = past[col]; res = check_guess(past, target)
-                    if res[col] == 2: color = GREEN
-                    elif res[col] == 1: color = YELLOW
-                    else: color = GRAY
-                    style, text_col = "fill", WHITE
-
                 # current guess
-                elif row == len(g_list): 
+                if row == len(g_list): 
                     if col < len(curr): letter, color = curr[col], (100,100,100)
                     if col == len(curr): color = BLACK 
                 
@@ -293,54 +331,66 @@ def play_time_attack(screen, duration, user_name):
                 if letter: 
                     draw_text(surf, letter, 26, text_col, rect.center, True)
 
-    category, target_word, max_guesses, guesses, current_guess = new_round()
+    keys = KeyboardState()
+    
+    # screen regions tracked for dirty-rect redraws
+    frame = DirtyFrame()
+    toggle_btn_rect = pygame.Rect(WIDTH - 100, 70, 90, 28)
     
     # main loop
     running = True
     while running:
-        screen.fill(BG_COLOR)
         mouse_pos = pygame.mouse.get_pos()
 
         # calculate remaining time
         current_time = time.time()
-        elapsed = current_time - start_time
-        remaining = max(0, duration - elapsed)
-        
-        if remaining == 0 and not time_up:
-            time_up = True
-            save_time_score(duration, score, user_name)
+        remaining = game.remaining()
+        if game.tick():
+            persist(save_time_score, duration, game.score, user_name) # off the render thread
+        time_up, score = game.time_up, game.score
+        category, round_ = game.category, game.round
+        target_word, max_guesses, guesses = round_.target, round_.max_guesses, round_.guesses
 
-        # header (includes timer and score)
-        pygame.draw.line(screen, ACCENT_COLOR, (0, 60), (WIDTH, 60), 2)
-        timer_col = RED if remaining < 10 else GREEN
-        draw_text(screen, f"{int(remaining)}s", 40, timer_col, (WIDTH - 60, 30), True)
-        draw_text(screen, f"SCORE: {score}", 30, TEXT_COLOR, (100, 30), True)
-
-        # keyboard toggle button
-        toggle_btn_rect = pygame.Rect(WIDTH - 100, 70, 90, 28)
-        btn_color = BUTTON_HOVER if toggle_btn_rect.collidepoint(mouse_pos) else ACCENT_COLOR
-        if not time_up:
-            pygame.draw.rect(screen, btn_color, toggle_btn_rect, border_radius=5)
-            btn_text = "HIDE KEY" if show_keyboard else "SHOW KEY"
-            draw_text(screen, btn_text, 12, WHITE, toggle_btn_rect.center, True)
-
-        if not time_up:
-            base_y = 125 
+        # finish the round transition once it has played out
+        if animating and (current_time - anim_start_time) >= anim_duration:
+            animating = False; announcement = ""
 
-            if not animating:
-                draw_grid_at_y(screen, base_y, guesses, current_guess, target_word, max_guesses, category)
-                # only draw keyboard if toggled on
-                if show_keyboard:
-                    draw_keyboard(screen, guesses, target_word) 
-            else:
-                # animation logic
-                progress = (current_time - anim_start_time) / anim_duration
-                if progress >= 1: 
-                    animating = False; announcement = ""
+        timer_col = RED if remaining < 10 else GREEN
+        frame.mark("timer", (WIDTH - 120, 0, 120, 60), (int(remaining), timer_col))
+        frame.mark("score", (0, 0, 220, 60), score)
+        frame.mark("toggle", toggle_btn_rect, (toggle_btn_rect.collidepoint(mouse_pos), show_keyboard, time_up))
+        anim_key = current_time if animating else None
+        frame.mark("board", (0, 62, WIDTH, HEIGHT - 62), (time_up, guesses, current_guess, target_word, show_keyboard, anim_key))
+
+        if frame.needs_redraw():
+            screen.fill(BG_COLOR)
+
+            # header (includes timer and score)
+            pygame.draw.line(screen, ACCENT_COLOR, (0, 60), (WIDTH, 60), 2)
+            draw_text(screen, f"{int(remaining)}s", 40, timer_col, (WIDTH - 60, 30), True)
+            draw_text(screen, f"SCORE: {score}", 30, TEXT_COLOR, (100, 30), True)
+
+            # keyboard toggle button
+            btn_color = BUTTON_HOVER if toggle_btn_rect.collidepoint(mouse_pos) else ACCENT_COLOR
+            if not time_up:
+                pygame.draw.rect(screen, btn_color, toggle_btn_rect, border_radius=5)
+                btn_text = "HIDE KEY" if show_keyboard else "SHOW KEY"
+                draw_text(screen, btn_text, 12, WHITE, toggle_btn_rect.center, True)
+
+            if not time_up:
+                base_y = 125 
+
+                if not animating:
+                    draw_grid_at_y(screen, base_y, guesses, current_guess, target_word, max_guesses, category)
+                    # only draw keyboard if toggled on
+                    if show_keyboard:
+                        draw_keyboard(screen, keys)
                 else:
+                    # animation logic
+                    progress = (current_time - anim_start_time) / anim_duration
                     smooth = 1 - pow(1 - progress, 3)
                     offset = HEIGHT * smooth
-                    o_gs, o_tar, o_cat, o_max = last_snapshot
+                    o_gs, o_tar, o_cat, o_max = game.last_round
                     draw_grid_at_y(screen, base_y - offset, o_gs, "", o_tar, o_max, o_cat)
                     draw_grid_at_y(screen, base_y + HEIGHT - offset, guesses, current_guess, target_word, max_guesses, category)
 
@@ -348,15 +398,20 @@ def play_time_attack(screen, duration, user_name):
                         s = pygame.Surface((WIDTH, 80)); s.set_alpha(200); s.fill((0,0,0))
                         screen.blit(s, (0, HEIGHT//2 - 40))
                         draw_text(screen, announcement, 20, GREEN, (WIDTH//2, HEIGHT//2), True)
-        else:
-            draw_text(screen, "TIME'S UP!", 50, RED, (WIDTH//2, HEIGHT//2 - 50), True)
-            draw_text(screen, f"Final Score: {score}", 30, TEXT_COLOR, (WIDTH//2, HEIGHT//2 + 10))
-            draw_text(screen, "Press ESC to return", 20, GRAY, (WIDTH//2, HEIGHT - 100))
+            else:
+                draw_text(screen, "TIME'S UP!", 50, RED, (WIDTH//2, HEIGHT//2 - 50), True)
+                draw_text(screen, f"Final Score: {score}", 30, TEXT_COLOR, (WIDTH//2, HEIGHT//2 + 10))
+                draw_text(screen, "Press ESC to return", 20, GRAY, (WIDTH//2, HEIGHT - 100))
 
-        pygame.display.flip()
+            frame.present()
+
+        # wake every animation frame, otherwise when the timer digits next change
+        if time_up: timeout = None
+        elif animating: timeout = 1000 // FPS
+        else: timeout = (remaining - int(remaining)) * 1000 + 1
 
         # event handling
-        for event in pygame.event.get():
+        for event in events.wait(timeout):
             if event.type == pygame.QUIT: 
                 return "QUIT"
             
@@ -373,19 +428,13 @@ def play_time_attack(screen, duration, user_name):
                         current_guess = current_guess[:-1]
 
                     elif event.key == pygame.K_RETURN:
-                        if len(current_guess) == 5:
-                            guesses.append(current_guess)
-                            if current_guess == target_word:
-                                score += 1
-                                last_snapshot = (guesses, target_word, category, max_guesses)
-                                category, target_word, max_guesses, guesses, current_guess = new_round()
-                                animating = True; anim_start_time = time.time(); announcement = f"CORRECT! Next: {category}"
-                            elif len(guesses) >= max_guesses:
-                                last_snapshot = (guesses, target_word, category, max_guesses)
-                                category, target_word, max_guesses, guesses, current_guess = new_round()
-                                animating = True; anim_start_time = time.time(); announcement = f"MISSED! Next: {category}"
+                        outcome = game.submit(current_guess)
+                        if outcome not in (None, "SHORT"):
                             current_guess = ""
+                            keys.restore(game.round.letters)
+                            if outcome == "WIN":
+                                animating = True; anim_start_time = time.time(); announcement = f"CORRECT! Next: {game.category}"
+                            elif outcome == "LOSE":
+                                animating = True; anim_start_time = time.time(); announcement = f"MISSED! Next: {game.category}"
 
-                    elif len(current_guess) < 5 and event.unicode.isalpha(): current_guess += event.unicode.upper()
-        
-        clock.tick(FPS)
\ No newline at end of file
+                    elif len(current_guess) < 5 and event.unicode.isalpha(): current_guess += event.unicode.upper()
\ No newline at end of file
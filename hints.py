@@ -0,0 +1,180 @@
+import threading
+import numpy as np
+import logic
+from logic import FeedbackTable, NUM_PATTERNS, check_guess, score_guess, encode_pattern, encode_words, check_guesses_batch
+from file_system import get_lexicon
+
+# most (guess, candidate) cells scored per request; keeps a hint inside one frame
+MAX_CELLS = 400_000
+# the same without a pattern matrix, where every cell is scored from scratch
+SCORED_CELLS = 60_000
+
+# word lists up to this many cells get the full pattern matrix (64 MB);
+# bigger ones score each request's block on the fly
+MATRIX_CELLS = 1 << 26
+
+# cells scored for the opening ranking, done once while the engine is built
+OPENING_CELLS = 1 << 26
+
+def partition_entropy(codes):
+    # codes: (P, C) pattern codes of P guesses against the same C candidates
+    # H = log2(C) - sum(c * log2(c)) / C over the non-empty pattern buckets
+    P, n = codes.shape
+    xlogx = np.arange(n + 1) * np.log2(np.maximum(np.arange(n + 1), 1))
+    if n >= 32:
+        # many candidates: one bincount over all (row, pattern) buckets
+        flat = codes.astype(np.int32) + (np.arange(P, dtype=np.int32) * NUM_PATTERNS)[:, None]
+        counts = np.bincount(flat.ravel(), minlength=P * NUM_PATTERNS)
+        spread = xlogx[counts].reshape(P, NUM_PATTERNS).sum(axis=1)
+    else:
+        # few candidates: runs in the sorted rows are the buckets, so cost follows cells
+        flat = np.sort(codes, axis=1).astype(np.int32)
+        flat += (np.arange(P, dtype=np.int32) * NUM_PATTERNS)[:, None]
+        flat = flat.ravel()
+        starts = np.flatnonzero(np.diff(flat, prepend=-1))
+        c = np.diff(starts, append=len(flat))
+        spread = np.bincount(flat[starts] // NUM_PATTERNS, weights=xlogx[c], minlength=P)
+    return np.log2(n) - spread / n
+
+def sample(idx, size):
+    # at most about size evenly spaced entries of idx
+    return idx[::max(1, -(-len(idx) // size))]
+
+class HintEngine:
+    # ranks next guesses by expected information (pattern-partition entropy)
+    # over the candidates that are still consistent with the feedback so far
+    def __init__(self, table):
+        self.table = table
+        if len(table) ** 2 <= MATRIX_CELLS:
+            table.build()
+        self.cells = MAX_CELLS if table.matrix is not None else SCORED_CELLS
+        self.words = self.table.words
+        self.reset()
+        everything = np.arange(len(self.words))
+        if not len(everything):
+            self.opening = everything # nothing to suggest; best() returns []
+            return
+        self.opening = self.rank(everything, sample(everything, max(1, OPENING_CELLS // len(everything))))
+
+    def reset(self):
+        self.candidates = np.ones(len(self.words), dtype=bool)  # candidate bitset
+        self.history = []   # (guess, pattern code) already applied
+
+    def block(self, pool, cand):
+        # pattern codes of the pool guesses against the cand targets
+        if self.table.matrix is not None:
+            return self.table.matrix[np.ix_(pool, cand)]
+        return check_guesses_batch(self.table.codes[pool], self.table.codes[cand])
+
+    def pattern_row(self, guess):
+        # pattern of guess against every lexicon word
+        g = self.table.index.get(guess)
+        if g is not None and self.table.matrix is not None:
+            return self.table.matrix[g]
+        if not guess.isascii():
+            # players may type letters like É, which encode_words can't pack
+            return np.fromiter((encode_pattern(score_guess(guess, w)) for w in self.words),
+                               dtype=np.uint8, count=len(self.words))
+        return check_guesses_batch(encode_words([guess]), self.table.codes)[0]
+
+    def apply(self, guess, code):
+        # narrows the candidates with one more piece of feedback
+        self.candidates &= self.pattern_row(guess) == code
+        self.history.append((guess, code))
+
+    def sync(self, guesses, target):
+        # brings the candidate set in line with the game, touching only new guesses
+        feedback = [(g, encode_pattern(check_guess(g, target))) for g in guesses]
+        if feedback[:len(self.history)] != self.history:
+            self.reset() # undo went past what we applied
+        for guess, code in feedback[len(self.history):]:
+            self.apply(guess, code)
+
+    def rank(self, pool, cand):
+        # entropy of the pattern distribution each pool word splits cand into
+        h = np.empty(len(pool))
+        rows = max(1, self.cells // len(cand))
+        for lo in range(0, len(pool), rows):
+            h[lo:lo + rows] = partition_entropy(self.block(pool[lo:lo + rows], cand))
+
+        # a guess that could itself be the answer wins ties
+        h += np.isin(pool, cand) / len(cand)
+        return pool[np.argsort(-h, kind='stable')]
+
+    def best(self, k=1):
+        # top k guesses for the current candidate set
+        cand = np.flatnonzero(self.candidates)
+        if len(cand) == 0:
+            return []
+        if len(cand) <= 2:
+            return [self.words[i] for i in cand[:k]]
+        if not self.history:
+            return [self.words[i] for i in self.opening[:k]]
+
+        # stay inside the budget: guess pool first, then sample the candidates
+        if len(cand) * len(cand) > self.cells:
+            cand_sample = cand[::max(1, len(cand) * len(cand) // self.cells)]
+        else:
+            cand_sample = cand
+        room = max(len(cand), self.cells // len(cand_sample))
+        pool = np.union1d(cand, self.opening[:max(0, room - len(cand))])[:room]
+        return [self.words[i] for i in self.rank(pool, cand_sample)[:k]]
+
+# one engine per word list; games build theirs on a background thread
+ENGINES = {}
+BUILDERS = {}   # key -> thread still building that engine
+LOCK = threading.Lock()
+
+def engine_key(category):
+    # category mode hints from that category, otherwise from the whole lexicon
+    lex = get_lexicon()
+    if category in lex.categories:
+        return category, lex.categories[category]['words']
+    return None, lex.all_words
+
+def build_engine(key):
+    try:
+        table = FeedbackTable(key[1])
+        # the whole lexicon shares check_guess's table instead of scoring a second one
+        if logic.FEEDBACK is not None and logic.FEEDBACK.words == table.words:
+            table = logic.FEEDBACK
+        engine = HintEngine(table)
+    except Exception as e:
+        # recorded as an engine with no words: "No hint available" instead of loading forever
+        print(f"Error: could not build hints: {e}")
+        engine = HintEngine(FeedbackTable([]))
+    ENGINES[key] = engine
+    with LOCK:
+        if BUILDERS.get(key) is threading.current_thread():
+            del BUILDERS[key]
+
+def get_engine(category=None):
+    # waits for the engine if it isn't built yet
+    key = engine_key(category)
+    with LOCK:
+        builder = BUILDERS.get(key)
+    if builder is not None:
+        builder.join()
+    if key not in ENGINES:
+        build_engine(key)
+    return ENGINES[key]
+
+def prepare(category=None):
+    # starts building the engine in the background; returns it once ready, else None
+    key = engine_key(category)
+    if key in ENGINES:
+        return ENGINES[key]
+    with LOCK:
+        if key not in BUILDERS:
+            BUILDERS[key] = threading.Thread(target=build_engine, args=(key,), daemon=True)
+            BUILDERS[key].start()
+    return None
+
+def suggest(guesses, target, category=None):
+    # best next guess for a game in progress, or None (also while the engine is still building)
+    engine = prepare(category)
+    if engine is None:
+        return None
+    engine.sync(guesses, target)
+    best = engine.best(1)
+    return best[0] if best else None
@@ -1,23 +1,187 @@
-def check_guess(guess, target):
+import numpy as np
+from functools import lru_cache
+
+# feedback patterns are packed as base-3 ints: sum(res[i] * 3**i)
+# 3**5 = 243 codes, so every pattern fits in a uint8
+NUM_PATTERNS = 3 ** 5
+WIN_CODE = NUM_PATTERNS - 1
+
+def score_guess(guess, target):
     # execute the main logic of comparing guess to target
     # returns list: 2:Green, 1:Yellow, 0:Gray
     res = [0] * 5
     target_counts = {}
-    
+
     # count frequency of each char in target
     for char in target:
         target_counts[char] = target_counts.get(char, 0) + 1
-        
+
     # green pass
     for i in range(5):
         if guess[i] == target[i]:
             res[i] = 2
             target_counts[guess[i]] -= 1
-            
+
     # yellow pass
     for i in range(5):
         if res[i] == 0 and guess[i] in target_counts and target_counts[guess[i]] > 0:
             res[i] = 1
             target_counts[guess[i]] -= 1
-            
-    return res
\ No newline at end of file
+
+    return res
+
+def encode_pattern(res):
+    # pack a 5 cell result into a single base-3 code
+    code = 0
+    for i in range(4, -1, -1):
+        code = code * 3 + res[i]
+    return code
+
+def decode_pattern(code):
+    # unpack a base-3 code back into a 5 cell result
+    res = [0] * 5
+    for i in range(5):
+        code, res[i] = divmod(code, 3)
+    return res
+
+# decoded patterns for every code, so decoding is a lookup
+PATTERNS = tuple(tuple(decode_pattern(c)) for c in range(NUM_PATTERNS))
+
+@lru_cache(maxsize=4096)
+def score_code(guess, target):
+    # scores pairs outside the lexicon (players may type any 5 letters)
+    return encode_pattern(score_guess(guess, target))
+
+def encode_words(words):
+    # 5-letter words -> (n, 5) uint8 array of code points
+    if not words:
+        return np.zeros((0, 5), dtype=np.uint8)
+    return np.frombuffer("".join(words).encode('ascii'), dtype=np.uint8).reshape(-1, 5)
+
+def check_guesses_batch(guesses, targets, chunk_cells=1 << 21):
+    # scores every guess against every target with numpy broadcasting
+    # guesses (G, 5) and targets (T, 5) are uint8 code point arrays
+    # returns a (G, T) uint8 matrix of pattern codes
+    guesses = np.asarray(guesses, dtype=np.uint8)
+    targets = np.asarray(targets, dtype=np.uint8)
+    G, T = len(guesses), len(targets)
+    out = np.empty((G, T), dtype=np.uint8)
+    if G == 0 or T == 0:
+        return out
+
+    # letter counts of each target, letter-major so a gather gives (G, T) rows
+    # (only over the code points in use; each target appears once per position,
+    # so a plain fancy-index add is safe and far cheaper than np.add.at)
+    base = min(guesses.min(), targets.min())
+    hi = max(guesses.max(), targets.max())
+    counts = np.zeros((int(hi) - int(base) + 1, T), dtype=np.int8)
+    cols = np.arange(T)
+    for k in range(5):
+        counts[targets[:, k] - base, cols] += 1
+
+    # chunk over guesses so the (G, T) temporaries stay small
+    rows = max(1, chunk_cells // T)
+    for lo in range(0, G, rows):
+        g = guesses[lo:lo + rows]
+        green = [g[:, k, None] == targets[None, :, k] for k in range(5)]
+        codes = np.zeros((len(g), T), dtype=np.uint8)
+
+        for i in range(5):
+            same = [(g[:, k] == g[:, i])[:, None] for k in range(5)]
+
+            # letters left in the target after the green pass
+            avail = counts[g[:, i] - base]
+            for k in range(5):
+                avail = avail - (green[k] & same[k])
+
+            # letters already used up by earlier yellows in this guess
+            used = np.zeros((len(g), T), dtype=np.int8)
+            for j in range(i):
+                used += ~green[j] & same[j]
+
+            yellow = ~green[i] & (used < avail)
+            codes += np.uint8(3 ** i) * (green[i].astype(np.uint8) * 2 + yellow)
+
+        out[lo:lo + rows] = codes
+    return out
+
+def verify_batch(words):
+    # compares the batch scorer against score_guess on every pair
+    # returns the list of mismatching (guess, target) pairs
+    words = [w for w in words if len(w) == 5]
+    arr = encode_words(words)
+    codes = check_guesses_batch(arr, arr)
+    bad = []
+    for g, guess in enumerate(words):
+        for t, target in enumerate(words):
+            if codes[g, t] != encode_pattern(score_guess(guess, target)):
+                bad.append((guess, target))
+    return bad
+
+class FeedbackTable:
+    # guess x target pattern matrix over a word list
+    # lazily only the target columns asked for are scored and kept;
+    # build() fills the whole n x n matrix for callers that need every pair
+    def __init__(self, words):
+        self.words = []
+        self.index = {}
+        for w in words:
+            w = w.strip().upper()
+            if len(w) == 5 and w.isascii() and w not in self.index: # others go through score_code
+                self.index[w] = len(self.words)
+                self.words.append(w)
+        self.codes = encode_words(self.words)
+        self.columns = {}   # target index -> codes of every guess against it
+        self.matrix = None  # (n, n), once built
+
+    def __len__(self):
+        return len(self.words)
+
+    def column(self, t):
+        # every lexicon guess scored against target t
+        if self.matrix is not None:
+            return self.matrix[:, t]
+        col = self.columns.get(t)
+        if col is None:
+            col = self.columns[t] = check_guesses_batch(self.codes, self.codes[t:t + 1])[:, 0]
+        return col
+
+    def build(self):
+        # eagerly fill the whole matrix in one vectorized pass
+        if self.matrix is None:
+            self.matrix = check_guesses_batch(self.codes, self.codes)
+            self.columns = {}
+        return self
+
+    def lookup(self, guess, target):
+        # returns the pattern code, or None if either word is unknown
+        g = self.index.get(guess)
+        t = self.index.get(target)
+        if g is None or t is None:
+            return None
+        return int(self.column(t)[g])
+
+# shared table for the loaded lexicon (set at startup)
+FEEDBACK = None
+
+def load_feedback_table(words, eager=False):
+    # builds the shared table for check_guess
+    global FEEDBACK
+    FEEDBACK = FeedbackTable(words)
+    if eager:
+        FEEDBACK.build()
+    return FEEDBACK
+
+def check_guess_code(guess, target):
+    # pattern code for a guess, served from the table when possible
+    if FEEDBACK is not None:
+        code = FEEDBACK.lookup(guess, target)
+        if code is not None:
+            return code
+    return score_code(guess, target)
+
+def check_guess(guess, target):
+    # returns list: 2:Green, 1:Yellow, 0:Gray
+    if len(guess) != 5 or len(target) != 5:
+        return score_guess(guess, target)
+    return list(PATTERNS[check_guess_code(guess, target)])
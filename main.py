@@ -1,19 +1,32 @@
 import pygame
 import sys
 from settings import *
-from file_system import load_users, save_users, get_standard_word, get_random_word, load_session, save_session, get_session_users, load_words, load_time_stats, get_timed_word, get_random_mix
+from file_system import load_player_stats, get_standard_word, get_random_word, load_session, save_session, get_session_users, load_words, load_time_stats, get_timed_word, get_random_mix, get_lexicon, category_diff, load_time_stats_list, refresh_time_stats
 from game_loop import play_game, play_time_attack
+from logic import load_feedback_table
+from calibrate import ensure_calibration
+from fonts import render_text, get_font
+from rendering import DirtyFrame, EventPump, ScreenTemplate, ScrollList, button_area
 
 # initialize pygame and global variables
 pygame.init()
 SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption(TITLE)
 
-USERS_LIST = load_users()
+# all players' stats; to_list() is the top-20 leaderboard view
+USERS_LIST = load_player_stats()
+
+# precompute guess/target feedback for the lexicon
+load_feedback_table(get_lexicon().all_words)
+
+# solver-derived max guesses per category, redone when words.txt changes
+ensure_calibration()
+
 CURRENT_USER = None
 
-def draw_button(rect, text, hover=False, color=ACCENT_COLOR, disabled=False):
-    # draws a button with hover and disabled states
+def draw_button(rect, text, hover=False, color=ACCENT_COLOR, disabled=False, surface=None):
+    # draws a button with hover and disabled states (onto the screen unless a surface is given)
+    surface = surface or SCREEN
     if disabled:
         draw_col = (180, 180, 170)  # gray = disabled
         text_col = (130, 130, 120)  # faded text
@@ -22,15 +35,14 @@ def draw_button(rect, text, hover=False, color=ACCENT_COLOR, disabled=False):
         text_col = TEXT_COLOR
 
     # button shadow
-    pygame.draw.rect(SCREEN, BLACK, (rect.x, rect.y+4, rect.w, rect.h), border_radius=10)
+    pygame.draw.rect(surface, BLACK, (rect.x, rect.y+4, rect.w, rect.h), border_radius=10)
     
     # main body
-    pygame.draw.rect(SCREEN, draw_col, rect, border_radius=10)
+    pygame.draw.rect(surface, draw_col, rect, border_radius=10)
     
     # text
-    font = pygame.font.SysFont(FONT_NAME, 20, bold=True)
-    surf = font.render(text, True, text_col)
-    SCREEN.blit(surf, surf.get_rect(center=rect.center))
+    surf = render_text(text, 20, text_col, True)
+    surface.blit(surf, surf.get_rect(center=rect.center))
 
 def update_stats(res):
     # updates leaderboard stats if user won
@@ -38,125 +50,100 @@ def update_stats(res):
         return
     
     if res['res'] == "WIN":
-        existing_data = USERS_LIST.find_user(CURRENT_USER)
-        
         # get data returned from game_loop.py
         l_word = res.get('target', 'N/A')
         l_guesses = ",".join(res.get('guesses', []))
         
-        # prepare new stats dictionary
-        new_stats = {
-            'name': CURRENT_USER,
-            'last_word': l_word,
-            'last_guesses': l_guesses
-        }
-        
-        # update existing stats
-        if existing_data:
-            new_total = float(existing_data['total_time']) + float(res['time'])
-            new_games = int(existing_data['games']) + 1
-            new_stats.update({
-                'avg_time': new_total / new_games,
-                'games': new_games,
-                'total_time': new_total
-            })
-            USERS_LIST.remove_user(CURRENT_USER)
-
-        # new user entry
-        else:
-            new_stats.update({
-                'avg_time': float(res['time']),
-                'games': 1,
-                'total_time': float(res['time'])
-            })
-            
-        USERS_LIST.add_sorted(new_stats)
-        save_users(USERS_LIST)
+        # every player's stats are kept, the top-20 view updates itself
+        USERS_LIST.record_win(CURRENT_USER, res['time'], l_word, l_guesses)
 
 
 def show_match_history(user_data):
     # displays past game history for a user
+    frame = DirtyFrame()
+    events = EventPump()
+    btn_rect = pygame.Rect(WIDTH//2 - 50, HEIGHT - 100, 100, 40)
     while True:
-        SCREEN.fill(BG_COLOR)
         mse = pygame.mouse.get_pos()
-        
-        font_h = pygame.font.SysFont(FONT_NAME, 30, bold=True)
-        font_r = pygame.font.SysFont(FONT_NAME, 22)
-        
-        title = font_h.render(f"HISTORY: {user_data['name']}", True, TEXT_COLOR)
-        SCREEN.blit(title, (WIDTH//2 - title.get_width()//2, 50))
-        
-        word_txt = font_r.render(f"Target Word: {user_data.get('word', 'N/A')}", True, GREEN)
-        SCREEN.blit(word_txt, (WIDTH//2 - word_txt.get_width()//2, 100))
-        
-        guesses = user_data.get('guesses', "").split(',')
-        start_y = 150
-        for i, g in enumerate(guesses):
-            if g:
-                txt = font_r.render(f"Guess {i+1}: {g}", True, BLACK)
-                SCREEN.blit(txt, (WIDTH//2 - txt.get_width()//2, start_y))
-                start_y += 30
-        
-        btn_rect = pygame.Rect(WIDTH//2 - 50, HEIGHT - 100, 100, 40)
-        draw_button(btn_rect, "CLOSE", btn_rect.collidepoint(mse))
-        
-        pygame.display.flip()
-        for e in pygame.event.get():
+        frame.mark("close", button_area(btn_rect), btn_rect.collidepoint(mse))
+
+        if frame.needs_redraw():
+            SCREEN.fill(BG_COLOR)
+            
+            title = render_text(f"HISTORY: {user_data['name']}", 30, TEXT_COLOR, True)
+            SCREEN.blit(title, (WIDTH//2 - title.get_width()//2, 50))
+            
+            word_txt = render_text(f"Target Word: {user_data.get('word', 'N/A')}", 22, GREEN)
+            SCREEN.blit(word_txt, (WIDTH//2 - word_txt.get_width()//2, 100))
+            
+            guesses = user_data.get('guesses', "").split(',')
+            start_y = 150
+            for i, g in enumerate(guesses):
+                if g:
+                    txt = render_text(f"Guess {i+1}: {g}", 22, BLACK)
+                    SCREEN.blit(txt, (WIDTH//2 - txt.get_width()//2, start_y))
+                    start_y += 30
+            
+            draw_button(btn_rect, "CLOSE", btn_rect.collidepoint(mse))
+            frame.present()
+
+        for e in events.wait():
             if e.type == pygame.QUIT: sys.exit()
             if e.type == pygame.MOUSEBUTTONDOWN and btn_rect.collidepoint(mse):
                 return
 
-def select_overwrite_slot():
-    # prompts player to select which session to overwrite
-    sessions = get_session_users()
-    while True:
-        SCREEN.fill(BG_COLOR)
-        mse = pygame.mouse.get_pos()
-        font = pygame.font.SysFont(FONT_NAME, 22, bold=True)
-        SCREEN.blit(font.render("STORAGE FULL (5/5)", True, RED), (WIDTH//2-100, 50))
-        for i, name in enumerate(sessions):
-            r = pygame.Rect((WIDTH-260)//2, 130 + i*60, 260, 50)
-            draw_button(r, f"Replace: {name}", r.collidepoint(mse), color=(200, 100, 100))
-            if pygame.mouse.get_pressed()[0] and r.collidepoint(mse): return name
-        pygame.display.flip()
-        for e in pygame.event.get():
-            if e.type == pygame.QUIT: sys.exit()
-
 def run_game_wrapper(cat, word, diff, guesses=[]):
 
     # runs the game and handles cleanup.
     # if finished, removes from resume tab and updates leaderboard
-    from file_system import delete_session # import helper
+    from file_system import delete_session, write_batch # import helper
     
     # 1. start game
-    res = play_game(SCREEN, cat, word, diff, CURRENT_USER, guesses, overwrite_func=select_overwrite_slot)
+    res = play_game(SCREEN, cat, word, diff, CURRENT_USER, guesses)
     
-    # 2. check if game is finished
+    # 2. check if game is finished (both saves share one commit)
     if isinstance(res, dict):
-        # cleanup: remove this account from "resume"
-        delete_session(CURRENT_USER)
-        
-        # leaderboard: update their leaderboard stats
-        if res.get('res') == "WIN":
-            update_stats(res)
+        with write_batch():
+            # cleanup: remove this account from "resume"
+            delete_session(CURRENT_USER)
+            
+            # leaderboard: update their leaderboard stats
+            if res.get('res') == "WIN":
+                update_stats(res)
+
+# static menu layers, rendered once (see rendering.ScreenTemplate)
+BACK_RECT = pygame.Rect(10, 10, 80, 30)
+DURATION_OPTS = [30, 60, 90]
+DURATION_RECTS = [pygame.Rect((WIDTH-200)//2, 160 + i*70, 200, 50) for i in range(len(DURATION_OPTS))]
+
+def draw_duration_screen(surf):
+    surf.fill(BG_COLOR)
+    draw_button(BACK_RECT, "BACK", surface=surf)
+    head = render_text("SELECT DURATION", 30, TEXT_COLOR, True)
+    surf.blit(head, (WIDTH//2 - head.get_width()//2, 80))
+    for r, dur in zip(DURATION_RECTS, DURATION_OPTS):
+        draw_button(r, f"{dur} SECONDS", surface=surf)
+
+DURATION_SCREEN = ScreenTemplate(draw_duration_screen)
 
 def time_attack_select():
     # select time duration for time attack mode
+    frame = DirtyFrame()
+    events = EventPump()
+    opts, rects = DURATION_OPTS, DURATION_RECTS
     while True:
-        SCREEN.fill(BG_COLOR)
         mse = pygame.mouse.get_pos()
-        draw_button(pygame.Rect(10, 10, 80, 30), "BACK")
-        font = pygame.font.SysFont(FONT_NAME, 30, bold=True)
-        head = font.render("SELECT DURATION", True, TEXT_COLOR)
-        SCREEN.blit(head, (WIDTH//2 - head.get_width()//2, 80))
-        opts = [30, 60, 90]
-        rects = []
-        for i, dur in enumerate(opts):
-            r = pygame.Rect((WIDTH-200)//2, 160 + i*70, 200, 50)
-            rects.append(r)
-            draw_button(r, f"{dur} SECONDS", r.collidepoint(mse))
-        pygame.display.flip()
-        for e in pygame.event.get():
+        for i, r in enumerate(rects):
+            frame.mark(i, button_area(r), r.collidepoint(mse))
+
+        if frame.needs_redraw():
+            DURATION_SCREEN.blit(SCREEN)
+            for r, dur in zip(rects, opts):
+                if r.collidepoint(mse):
+                    draw_button(r, f"{dur} SECONDS", True)
+            frame.present()
+
+        for e in events.wait():
             if e.type == pygame.QUIT: sys.exit()
             if e.type == pygame.MOUSEBUTTONDOWN:
                 if pygame.Rect(10,10,80,30).collidepoint(mse): return
@@ -165,46 +152,78 @@ def time_attack_select():
                 if rects[1].collidepoint(mse): play_time_attack(SCREEN, 60, CURRENT_USER); return
                 if rects[2].collidepoint(mse): play_time_attack(SCREEN, 90, CURRENT_USER); return
 
+def cat_rects(n):
+    return [pygame.Rect((WIDTH-200)//2, 100 + i*60, 200, 50) for i in range(n)]
+
+def draw_cat_screen(surf, cats):
+    surf.fill(BG_COLOR)
+    draw_button(BACK_RECT, "BACK", surface=surf)
+    for r, cat in zip(cat_rects(len(cats)), cats):
+        draw_button(r, cat, surface=surf)
+
+CAT_SCREEN = ScreenTemplate(draw_cat_screen)
+
 # category selection
 def cat_select():
     cats = list(load_words().keys())
+    frame = DirtyFrame()
+    events = EventPump()
+    rects = cat_rects(len(cats))
     while True:
-        SCREEN.fill(BG_COLOR)
         mse = pygame.mouse.get_pos()
-        draw_button(pygame.Rect(10, 10, 80, 30), "BACK")
-        for i, cat in enumerate(cats):
-            r = pygame.Rect((WIDTH-200)//2, 100 + i*60, 200, 50)
-            draw_button(r, cat, r.collidepoint(mse))
-            if pygame.mouse.get_pressed()[0] and r.collidepoint(mse):
-                word, diff = get_random_word(cat)
-                run_game_wrapper(cat, word, diff)
-                return
-        for e in pygame.event.get():
+        for i, r in enumerate(rects):
+            frame.mark(i, button_area(r), r.collidepoint(mse))
+
+        if frame.needs_redraw():
+            CAT_SCREEN.blit(SCREEN, tuple(cats))
+            for r, cat in zip(rects, cats):
+                if r.collidepoint(mse):
+                    draw_button(r, cat, True)
+            frame.present()
+
+        for e in events.wait():
             if e.type == pygame.QUIT: sys.exit()
-            if e.type == pygame.MOUSEBUTTONDOWN and pygame.Rect(10,10,80,30).collidepoint(mse): return
+            if e.type == pygame.MOUSEBUTTONDOWN:
+                if pygame.Rect(10,10,80,30).collidepoint(mse): return
+                for r, cat in zip(rects, cats):
+                    if r.collidepoint(mse):
+                        word, diff = get_random_word(cat)
+                        run_game_wrapper(cat, word, diff)
+                        return
+
+MODE_OPTS = ["TIMED WORDLE", "INFINITE WORDLE", "CATEGORY MODE", "TIME ATTACK"]
+MODE_RECTS = [pygame.Rect((WIDTH-220)//2, 160 + i*70, 220, 50) for i in range(len(MODE_OPTS))]
+
+def draw_mode_screen(surf, username):
+    surf.fill(BG_COLOR)
+    draw_button(BACK_RECT, "BACK", surface=surf)
+    head = render_text(f"Welcome, {username}", 30, TEXT_COLOR, True)
+    surf.blit(head, (WIDTH//2 - head.get_width()//2, 80))
+    for r, opt in zip(MODE_RECTS, MODE_OPTS):
+        draw_button(r, opt, surface=surf)
+
+MODE_SCREEN = ScreenTemplate(draw_mode_screen)
 
 def gamemode_select(username):
     # select gamemode after username entry
     global CURRENT_USER
     CURRENT_USER = username
+    frame = DirtyFrame()
+    events = EventPump()
+    opts, rects = MODE_OPTS, MODE_RECTS
     while True:
-        SCREEN.fill(BG_COLOR)
         mse = pygame.mouse.get_pos()
-        draw_button(pygame.Rect(10, 10, 80, 30), "BACK")
-        
-        head = pygame.font.SysFont(FONT_NAME, 30, bold=True).render(f"Welcome, {username}", True, TEXT_COLOR)
-        SCREEN.blit(head, (WIDTH//2 - head.get_width()//2, 80))
-        
-        opts = ["TIMED WORDLE", "INFINITE WORDLE", "CATEGORY MODE", "TIME ATTACK"]
-        rects = []
-        for i, opt in enumerate(opts):
-            r = pygame.Rect((WIDTH-220)//2, 160 + i*70, 220, 50)
-            rects.append(r)
-            draw_button(r, opt, r.collidepoint(mse))
-            
-        pygame.display.flip()
-        
-        for e in pygame.event.get():
+        for i, r in enumerate(rects):
+            frame.mark(i, button_area(r), r.collidepoint(mse))
+
+        if frame.needs_redraw():
+            MODE_SCREEN.blit(SCREEN, username)
+            for r, opt in zip(rects, opts):
+                if r.collidepoint(mse):
+                    draw_button(r, opt, True)
+            frame.present()
+        
+        for e in events.wait():
             if e.type == pygame.QUIT:
                 sys.exit()
             if e.type == pygame.MOUSEBUTTONDOWN:
@@ -233,45 +252,62 @@ def gamemode_select(username):
                     time_attack_select()
                     return
 
+NAME_BOX = pygame.Rect(WIDTH//2 - 120, HEIGHT//2, 240, 50)
+
+def draw_register_screen(surf):
+    surf.fill(BG_COLOR)
+    
+    # title
+    head = render_text("NEW GAME REGISTRATION", 30, TEXT_COLOR)
+    surf.blit(head, (WIDTH//2 - head.get_width()//2, 50))
+    
+    # label
+    lbl = render_text("ENTER NEW USERNAME:", 30, BLACK)
+    surf.blit(lbl, (WIDTH//2 - lbl.get_width()//2, HEIGHT//2 - 60))
+    
+    # input name box
+    pygame.draw.rect(surf, WHITE, NAME_BOX, border_radius=5)
+    pygame.draw.rect(surf, ACCENT_COLOR, NAME_BOX, 2, border_radius=5)
+    draw_button(BACK_RECT, "BACK", surface=surf)
+
+REGISTER_SCREEN = ScreenTemplate(draw_register_screen)
+
 def new_game_flow():
 
     # get username, checks uniqueness against leaderboard and resume tab, then goes to gamemode select.
     name = ""
-    font = pygame.font.SysFont(FONT_NAME, 30)
     error_msg = ""
+    frame = DirtyFrame()
+    events = EventPump()
+    box = NAME_BOX
+    err_area = pygame.Rect(0, HEIGHT//2 + 60, WIDTH, 50)
+    back_rect = BACK_RECT
     
     while True:
-        SCREEN.fill(BG_COLOR)
-        
-        # title
-        head = font.render("NEW GAME REGISTRATION", True, TEXT_COLOR)
-        SCREEN.blit(head, (WIDTH//2 - head.get_width()//2, 50))
-        
-        # label
-        lbl = font.render("ENTER NEW USERNAME:", True, BLACK)
-        SCREEN.blit(lbl, (WIDTH//2 - lbl.get_width()//2, HEIGHT//2 - 60))
-        
-        # input name box
-        box = pygame.Rect(WIDTH//2 - 120, HEIGHT//2, 240, 50)
-        pygame.draw.rect(SCREEN, WHITE, box, border_radius=5)
-        pygame.draw.rect(SCREEN, ACCENT_COLOR, box, 2, border_radius=5)
-        
-        # render name
-        txt = font.render(name, True, BLACK)
-        SCREEN.blit(txt, (box.x + 10, box.y + 10))
-        
-        # error message display
-        if error_msg:
-            err = pygame.font.SysFont(FONT_NAME, 20).render(error_msg, True, RED)
-            SCREEN.blit(err, (WIDTH//2 - err.get_width()//2, HEIGHT//2 + 70))
-        
-        # back button
-        back_rect = pygame.Rect(10, 10, 80, 30)
-        draw_button(back_rect, "BACK", back_rect.collidepoint(pygame.mouse.get_pos()))
-        
-        pygame.display.flip()
+        mse = pygame.mouse.get_pos()
+        frame.mark("name", box, name)
+        frame.mark("error", err_area, error_msg)
+        frame.mark("back", button_area(back_rect), back_rect.collidepoint(mse))
+
+        if frame.needs_redraw():
+            # title, label, empty name box and idle back button
+            REGISTER_SCREEN.blit(SCREEN)
+            
+            # render name
+            txt = render_text(name, 30, BLACK)
+            SCREEN.blit(txt, (box.x + 10, box.y + 10))
+            
+            # error message display
+            if error_msg:
+                err = render_text(error_msg, 20, RED)
+                SCREEN.blit(err, (WIDTH//2 - err.get_width()//2, HEIGHT//2 + 70))
+            
+            # back button
+            if back_rect.collidepoint(mse):
+                draw_button(back_rect, "BACK", True)
+            frame.present()
         
-        for e in pygame.event.get():
+        for e in events.wait():
             if e.type == pygame.QUIT: 
                 sys.exit()
             if e.type == pygame.MOUSEBUTTONDOWN:
@@ -308,14 +344,11 @@ def resume_menu():
     global CURRENT_USER
     
     pygame.event.clear(pygame.MOUSEBUTTONDOWN)
+    frame = DirtyFrame()
+    events = EventPump()
     
     while True:
-        SCREEN.fill(BG_COLOR)
         mouse_pos = pygame.mouse.get_pos()
-        draw_button(pygame.Rect(10, 10, 80, 30), "BACK")
-        
-        head = pygame.font.SysFont(FONT_NAME, 30, bold=True).render("SELECT ACCOUNT", True, TEXT_COLOR)
-        SCREEN.blit(head, (WIDTH//2 - head.get_width()//2, 60))
         
         sessions = get_session_users()
         if not sessions:
@@ -324,14 +357,24 @@ def resume_menu():
         start_y = 130
         account_rects = []
 
-        for i, name in enumerate(sessions):
+        # as many accounts as fit on screen (capacity is configurable)
+        for i, name in enumerate(sessions[:(HEIGHT - start_y) // 60]):
             r = pygame.Rect((WIDTH-260)//2, start_y + i*60, 260, 50)
             account_rects.append((r, name))
-            draw_button(r, name, r.collidepoint(mouse_pos))
+            frame.mark(i, button_area(r), (name, r.collidepoint(mouse_pos)))
+
+        if frame.needs_redraw():
+            SCREEN.fill(BG_COLOR)
+            draw_button(pygame.Rect(10, 10, 80, 30), "BACK")
+            
+            head = render_text("SELECT ACCOUNT", 30, TEXT_COLOR, True)
+            SCREEN.blit(head, (WIDTH//2 - head.get_width()//2, 60))
             
-        pygame.display.flip()
+            for r, name in account_rects:
+                draw_button(r, name, r.collidepoint(mouse_pos))
+            frame.present()
         
-        for e in pygame.event.get():
+        for e in events.wait():
             if e.type == pygame.QUIT:
                 sys.exit()
             
@@ -348,134 +391,154 @@ def resume_menu():
                         if data: 
                             diff = 6
                             if data['category'] != "WORDLE":
-                                all_words = load_words()
-                                if data['category'] in all_words: 
-                                    diff = all_words[data['category']]['diff']
+                                diff = category_diff(data['category'])
                             
                             run_game_wrapper(data['category'], data['target'], diff, data['guesses'])
                         return
 
+# leaderboard rows, each drawn once into a ScrollList page
+ROW_H = 35
+
+def draw_view_button(surf, btn_rect, hover):
+    pygame.draw.rect(surf, BLACK, (btn_rect.x, btn_rect.y+2, btn_rect.w, btn_rect.h), border_radius=5)
+    pygame.draw.rect(surf, BUTTON_HOVER if hover else ACCENT_COLOR, btn_rect, border_radius=5)
+    btn_txt = render_text("VIEW", 14, WHITE, True)
+    surf.blit(btn_txt, btn_txt.get_rect(center=btn_rect.center))
+
+def draw_user_row(surf, u, y):
+    # rows skip the shared text cache so a long board can't flush it
+    row = f"{u['name']:<25} {u['avg_time']:.1f}s"
+    surf.blit(get_font(20).render(row, True, TEXT_COLOR), (50, y))
+    draw_view_button(surf, pygame.Rect(320, y, 80, 25), False)
+
+def draw_time_row(surf, r, y):
+    row = f"{r['name']:<25} {r['score']} Words          {r['dur']}s"
+    surf.blit(get_font(20).render(row, True, TEXT_COLOR), (50, y))
+
+USER_ROWS = ScrollList(WIDTH, ROW_H, draw_user_row, lambda u: (u['name'], u['avg_time']))
+TIME_ROWS = ScrollList(WIDTH, ROW_H, draw_time_row, lambda r: (r['name'], r['score'], r['dur']))
+
 def show_leaderboard():
 
     # displays the leaderboard with tabs for classic and time attack modes
+    # (other game instances sharing the data folder may have saved since we loaded)
+    USERS_LIST.refresh()
+    refresh_time_stats()
     tab = "CLASSIC"
     scroll_y = 0  
+    frame = DirtyFrame()
+    events = EventPump()
+    content_rect = pygame.Rect(0, 155, WIDTH, 395)
+    
+    # tab buttons
+    c_rect = pygame.Rect(WIDTH//2 - 110, 70, 100, 30)
+    t_rect = pygame.Rect(WIDTH//2 + 10, 70, 100, 30)
     
     while True:
-        SCREEN.fill(BG_COLOR)
         mse = pygame.mouse.get_pos()
+        adj_mouse = (mse[0], mse[1] - 155)
         
-        # 1. scrollable content area
-        content_surface = pygame.Surface((WIDTH, 400)) 
-        content_surface.fill(BG_COLOR)
-        y_offset = 10 + scroll_y 
-        
-        # classic tab
-        if tab == "CLASSIC":
-            users = USERS_LIST.to_list()
-            for u in users:
-                if -30 < y_offset < 400:
-                    row = f"{u['name']:<25} {u['avg_time']:.1f}s"
-                    content_surface.blit(pygame.font.SysFont(FONT_NAME, 20).render(row, True, TEXT_COLOR), (50, y_offset))
-                    
-                    # history button
-                    btn_rect = pygame.Rect(320, y_offset, 80, 25)
-                    adj_mouse = (mse[0], mse[1] - 155)
-                    btn_hover = btn_rect.collidepoint(adj_mouse)
-                    
-                    pygame.draw.rect(content_surface, BLACK, (btn_rect.x, btn_rect.y+2, btn_rect.w, btn_rect.h), border_radius=5)
-                    pygame.draw.rect(content_surface, BUTTON_HOVER if btn_hover else ACCENT_COLOR, btn_rect, border_radius=5)
-                    btn_txt = pygame.font.SysFont(FONT_NAME, 14, bold=True).render("VIEW", True, WHITE)
-                    content_surface.blit(btn_txt, btn_txt.get_rect(center=btn_rect.center))
-                    
-                    if btn_hover and pygame.mouse.get_pressed()[0]:
-                        history_data = {'name': u['name'], 'word': u.get('last_word', 'N/A'), 'guesses': u.get('last_guesses', '')}
-                        show_match_history(history_data)
-                y_offset += 35
-            max_scroll = max(0, (len(users) * 35) - 350)
-
-        # time attack tab (does not handle uniqueness checking here)
-        else:
-            from file_system import load_time_stats_list
-            records = load_time_stats_list()
-            for r in records:
-                if -30 < y_offset < 400:
-                    row = f"{r['name']:<25} {r['score']} Words          {r['dur']}s"
-                    content_surface.blit(pygame.font.SysFont(FONT_NAME, 20).render(row, True, TEXT_COLOR), (50, y_offset))
-                y_offset += 35
-            max_scroll = max(0, (len(records) * 35) - 350)
-
-        SCREEN.blit(content_surface, (0, 155))
-
-        pygame.draw.rect(SCREEN, BG_COLOR, (0, 0, WIDTH, 155))
-        pygame.draw.rect(SCREEN, BG_COLOR, (0, 550, WIDTH, 50))
-
-        # draw title
-        font_title = pygame.font.SysFont(FONT_NAME, 32, bold=True)
-        title_surf = font_title.render("LEADERBOARD", True, TEXT_COLOR)
-        SCREEN.blit(title_surf, (WIDTH//2 - title_surf.get_width()//2, 20))
-
-        # draw back button
-        draw_button(pygame.Rect(10, 10, 80, 30), "BACK")
-        
-        # draw tabs
-        c_rect = pygame.Rect(WIDTH//2 - 110, 70, 100, 30)
-        t_rect = pygame.Rect(WIDTH//2 + 10, 70, 100, 30)
-        c_col = GREEN if tab == "CLASSIC" else ACCENT_COLOR
-        t_col = YELLOW if tab == "TIME" else ACCENT_COLOR
-        draw_button(c_rect, "CLASSIC", False, color=c_col)
-        draw_button(t_rect, "TIME", False, color=t_col)
-        
-        # column headers
-        font_bold = pygame.font.SysFont(FONT_NAME, 20, bold=True)
+        # rows currently shown (cached views, replaced whenever the data changes)
         if tab == "CLASSIC":
-            SCREEN.blit(font_bold.render("NAME              AVG TIME", True, BLACK), (50, 120))
+            rows, widget = USERS_LIST.to_list(), USER_ROWS
         else:
-            SCREEN.blit(font_bold.render("PLAYER          SCORE          DUR", True, BLACK), (50, 120))
-        pygame.draw.line(SCREEN, GRAY, (50, 150), (450, 150))
+            rows, widget = load_time_stats_list(), TIME_ROWS
+        max_scroll = max(0, (len(rows) * ROW_H) - 350)
+        
+        # the only VIEW button that can be under the mouse
+        hovered = None
+        if tab == "CLASSIC" and content_rect.collidepoint(mse):
+            i = widget.row_at(adj_mouse[1], -scroll_y)
+            if 0 <= i < len(rows):
+                btn_rect = pygame.Rect(320, widget.row_top(i, -scroll_y), 80, 25)
+                if btn_rect.collidepoint(adj_mouse):
+                    hovered = i
+        
+        frame.mark("header", pygame.Rect(0, 0, WIDTH, 155), tab)
+        frame.mark("content", content_rect, (tab, scroll_y, id(rows), len(rows), hovered))
+        
+        if frame.needs_redraw():
+            SCREEN.fill(BG_COLOR)
+            
+            # 1. scrollable content area: visible slices of the pre-drawn pages
+            widget.draw(SCREEN, content_rect, rows, -scroll_y)
+            if hovered is not None:
+                btn_rect = pygame.Rect(320, content_rect.y + widget.row_top(hovered, -scroll_y), 80, 25)
+                SCREEN.set_clip(content_rect)
+                draw_view_button(SCREEN, btn_rect, True)
+                SCREEN.set_clip(None)
+            
+            # draw title
+            title_surf = render_text("LEADERBOARD", 32, TEXT_COLOR, True)
+            SCREEN.blit(title_surf, (WIDTH//2 - title_surf.get_width()//2, 20))
+            
+            # draw back button
+            draw_button(pygame.Rect(10, 10, 80, 30), "BACK")
+            
+            # draw tabs
+            c_col = GREEN if tab == "CLASSIC" else ACCENT_COLOR
+            t_col = YELLOW if tab == "TIME" else ACCENT_COLOR
+            draw_button(c_rect, "CLASSIC", False, color=c_col)
+            draw_button(t_rect, "TIME", False, color=t_col)
+            
+            # column headers
+            if tab == "CLASSIC":
+                SCREEN.blit(render_text("NAME              AVG TIME", 20, BLACK, True), (50, 120))
+            else:
+                SCREEN.blit(render_text("PLAYER          SCORE          DUR", 20, BLACK, True), (50, 120))
+            pygame.draw.line(SCREEN, GRAY, (50, 150), (450, 150))
+            frame.present()
 
-        pygame.display.flip()
-        
-        for e in pygame.event.get():
+        for e in events.wait():
             if e.type == pygame.QUIT: sys.exit()
             if e.type == pygame.MOUSEBUTTONDOWN:
                 if e.button == 4: scroll_y = min(0, scroll_y + 20)
                 if e.button == 5: scroll_y = max(-max_scroll, scroll_y - 20)
+                if e.button == 1 and hovered is not None:
+                    u = rows[hovered]
+                    history_data = {'name': u['name'], 'word': u.get('last_word', 'N/A'), 'guesses': u.get('last_guesses', '')}
+                    show_match_history(history_data)
                 if pygame.Rect(10, 10, 80, 30).collidepoint(e.pos): return
                 if c_rect.collidepoint(e.pos): tab, scroll_y = "CLASSIC", 0
                 if t_rect.collidepoint(e.pos): tab, scroll_y = "TIME", 0
 
+MENU_OPTS = ["NEW GAME", "RESUME", "LEADERBOARD", "EXIT"]
+MENU_RECTS = [pygame.Rect((WIDTH-200)//2, 150 + i*70, 200, 50) for i in range(len(MENU_OPTS))]
+
+def draw_menu_screen(surf, sessions_available):
+    surf.fill(BG_COLOR)
+    title = render_text("Khoa's Wordle", 40, TEXT_COLOR, True)
+    surf.blit(title, (WIDTH//2 - title.get_width()//2, 50))
+    for r, opt in zip(MENU_RECTS, MENU_OPTS):
+        draw_button(r, opt, disabled=(opt == "RESUME" and not sessions_available), surface=surf)
+
+MENU_SCREEN = ScreenTemplate(draw_menu_screen)
+
 def main_menu():
     # main menu display and navigation
     global CURRENT_USER
+    frame = DirtyFrame()
+    events = EventPump()
+    options, rects = MENU_OPTS, MENU_RECTS
 
     while True:
-        SCREEN.fill(BG_COLOR)
         mouse_pos = pygame.mouse.get_pos()
         
         # check active sessions
         active_sessions = get_session_users()
         sessions_available = len(active_sessions) > 0 
         
-        font = pygame.font.SysFont(FONT_NAME, 40, bold=True)
-        title = font.render("Khoa's Wordle", True, TEXT_COLOR)
-        SCREEN.blit(title, (WIDTH//2 - title.get_width()//2, 50))
-        
-        options = ["NEW GAME", "RESUME", "LEADERBOARD", "EXIT"]
-        rects = []
-        for i, opt in enumerate(options):
-            r = pygame.Rect((WIDTH-200)//2, 150 + i*70, 200, 50)
-            rects.append(r)
-            
-            if opt == "RESUME":
-                is_hover = r.collidepoint(mouse_pos) and sessions_available
-                draw_button(r, opt, is_hover, disabled=not sessions_available)
-            else:
-                draw_button(r, opt, r.collidepoint(mouse_pos))
+        for i, r in enumerate(rects):
+            frame.mark(i, button_area(r), (r.collidepoint(mouse_pos), sessions_available))
         
-        pygame.display.flip()
+        if frame.needs_redraw():
+            MENU_SCREEN.blit(SCREEN, sessions_available)
+            for r, opt in zip(rects, options):
+                if r.collidepoint(mouse_pos) and (opt != "RESUME" or sessions_available):
+                    draw_button(r, opt, True)
+            frame.present()
         
-        for e in pygame.event.get():
+        for e in events.wait():
             if e.type == pygame.QUIT:
                 sys.exit()
             
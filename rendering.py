@@ -0,0 +1,152 @@
+import pygame
+import settings
+from collections import OrderedDict
+from settings import DIRTY_RECTS, EVENT_WAIT, FPS
+
+# the frame that last presented to the display
+# if another screen drew in between, the next frame must be a full redraw
+_last_presenter = None
+
+def button_area(rect):
+    # button body plus its drop shadow
+    return rect.union(rect.move(0, 4))
+
+class DirtyFrame:
+    # tracks which screen regions changed since the last presented frame
+    # usage per tick: mark() every region, then redraw only if needs_redraw()
+    def __init__(self):
+        self.regions = {}  # name -> (rect, state key)
+        self.dirty = []
+        self.full = True
+
+    def mark(self, name, rect, key):
+        # records the visual state of a region; a new key makes it dirty
+        rect = pygame.Rect(rect)
+        old = self.regions.get(name)
+        if old is None or old[1] != key or old[0] != rect:
+            self.dirty.append(rect)
+            if old is not None and old[0] != rect:
+                self.dirty.append(old[0])
+        self.regions[name] = (rect, key)
+
+    def invalidate(self):
+        # forces a full redraw on the next tick
+        self.full = True
+
+    def needs_redraw(self):
+        if not DIRTY_RECTS or _last_presenter is not self:
+            self.full = True
+        return self.full or bool(self.dirty)
+
+    def present(self):
+        # pushes the drawn frame to the display
+        global _last_presenter
+        if self.full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.dirty)
+        self.dirty = []
+        self.full = False
+        _last_presenter = self
+
+class EventPump:
+    # blocks on input instead of spinning the loop at FPS
+    # screens pass a timeout (ms) only while a timer or animation needs waking
+    def __init__(self):
+        self.clock = pygame.time.Clock()
+
+    def wait(self, timeout=None):
+        # never wake more often than FPS, even under a flood of events
+        self.clock.tick(FPS)
+        if not EVENT_WAIT:
+            return pygame.event.get()
+
+        if timeout is None:
+            first = pygame.event.wait()
+        else:
+            first = pygame.event.wait(max(1, int(timeout)))
+        if first.type == pygame.NOEVENT:
+            return []
+        return [first] + pygame.event.get()
+
+def theme_key():
+    # everything a static layer's look depends on besides its layout
+    return (settings.BG_COLOR, settings.ACCENT_COLOR, settings.BUTTON_HOVER, settings.BLACK,
+            settings.WHITE, settings.TEXT_COLOR, settings.GRAY, settings.RED, settings.GREEN, settings.FONT_NAME)
+
+class ScreenTemplate:
+    # a menu's static layer (background, titles, idle buttons) rendered once
+    # draw(surface, *args) paints it; rebuilt when args, window size or theme change
+    def __init__(self, draw):
+        self.draw = draw
+        self.key = None
+        self.surface = None
+
+    def blit(self, screen, *args):
+        key = (screen.get_size(), theme_key(), args)
+        if key != self.key:
+            self.surface = pygame.Surface(screen.get_size())
+            self.draw(self.surface, *args)
+            self.key = key
+        screen.blit(self.surface, (0, 0))
+
+class ScrollList:
+    # virtualized scrolling list: rows are drawn once into pages of PAGE_ROWS rows,
+    # and a frame only blits the one or two pages crossing the view
+    # a page is redrawn only when the rows on it (or the theme) change
+    PAGE_ROWS = 32
+
+    def __init__(self, width, row_h, draw_row, row_key, pad=10, max_pages=8):
+        self.width = width
+        self.row_h = row_h
+        self.draw_row = draw_row    # draw_row(surface, row, y) paints one row at y
+        self.row_key = row_key      # row -> hashable visual state
+        self.pad = pad              # space above the first row
+        self.max_pages = max_pages
+        self.pages = OrderedDict()  # page index -> (row keys, surface), LRU
+        self.theme = None
+
+    def page(self, rows, p):
+        lo = p * self.PAGE_ROWS
+        chunk = rows[lo:lo + self.PAGE_ROWS]
+        keys = tuple(self.row_key(r) for r in chunk)
+        hit = self.pages.get(p)
+        if hit is not None and hit[0] == keys:
+            self.pages.move_to_end(p)
+            return hit[1]
+
+        surf = pygame.Surface((self.width, self.PAGE_ROWS * self.row_h))
+        surf.fill(settings.BG_COLOR)
+        for i, row in enumerate(chunk):
+            self.draw_row(surf, row, i * self.row_h)
+        self.pages[p] = (keys, surf)
+        self.pages.move_to_end(p)
+        while len(self.pages) > self.max_pages:
+            self.pages.popitem(last=False)
+        return surf
+
+    def draw(self, screen, view, rows, offset):
+        # draws content rows [offset, offset + view.h) into the view rect
+        if self.theme != theme_key():
+            self.pages.clear()
+            self.theme = theme_key()
+
+        old_clip = screen.get_clip()
+        screen.set_clip(view)
+        screen.fill(settings.BG_COLOR, view)
+        page_h = self.PAGE_ROWS * self.row_h
+        first = max(0, (offset - self.pad) // page_h)
+        last = (offset - self.pad + view.h) // page_h
+        for p in range(first, last + 1):
+            if p * self.PAGE_ROWS >= len(rows):
+                break
+            screen.blit(self.page(rows, p), (view.x, view.y + self.pad + p * page_h - offset))
+        screen.set_clip(old_clip)
+
+    def row_at(self, y, offset):
+        # index of the row under content-relative y, may be out of range
+        return (y + offset - self.pad) // self.row_h
+
+    def row_top(self, i, offset):
+        # view-relative y of row i
+        return self.pad + i * self.row_h - offset
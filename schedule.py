@@ -0,0 +1,10 @@
+import datetime
+import sys
+from file_system import DAILY
+
+# prints a season's daily words for auditing
+# usage: python schedule.py [year]
+
+if __name__ == "__main__":
+    year = int(sys.argv[1]) if len(sys.argv) > 1 else datetime.date.today().year
+    print("\n".join(DAILY.emit_year(year)))
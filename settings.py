@@ -20,4 +20,11 @@ TEXT_COLOR = (75, 54, 33)
 # UI + fonts
 BUTTON_HOVER = (180, 150, 110)
 BORDER_RADIUS = 8
-FONT_NAME = "Georgia"
\ No newline at end of file
+FONT_NAME = "Georgia"
+
+# undo/redo history per game (None = unlimited)
+UNDO_LIMIT = None
+
+# rendering
+DIRTY_RECTS = True  # only redraw and push regions that changed
+EVENT_WAIT = True   # sleep until input arrives instead of polling every frame
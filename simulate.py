@@ -0,0 +1,125 @@
+import importlib
+import multiprocessing
+import random
+import sys
+import time
+from collections import Counter
+import numpy as np
+from engine import GameEngine
+from file_system import get_lexicon, category_diff
+from hints import get_engine
+from logic import encode_pattern
+
+# bulk playouts of the classic game with no display
+# usage: python simulate.py [strategy] [games per category] [workers] [category]
+#   strategy  random | consistent | entropy | module:Class
+#   category  a category from words.txt, WORDLE for the whole lexicon, or ALL
+
+class RandomStrategy:
+    # any 5-letter lexicon word, ignoring feedback
+    def __init__(self, category, rng):
+        self.hints = get_engine(category)
+        self.rng = rng
+
+    def start(self, game):
+        self.hints.reset()
+
+    def guess(self, game):
+        return self.rng.choice(self.hints.words)
+
+class ConsistentStrategy(RandomStrategy):
+    # a random word that still fits every piece of feedback so far
+    def catch_up(self, game):
+        for g, res in game.feedback()[len(self.hints.history):]:
+            self.hints.apply(g, encode_pattern(res))
+
+    def guess(self, game):
+        self.catch_up(game)
+        cand = np.flatnonzero(self.hints.candidates)
+        if len(cand) == 0:
+            return self.rng.choice(self.hints.words) # target is not in the word list
+        return self.hints.words[cand[self.rng.randrange(len(cand))]]
+
+class EntropyStrategy(ConsistentStrategy):
+    # the in-game hint: most informative guess for the remaining candidates
+    def guess(self, game):
+        self.catch_up(game)
+        best = self.hints.best(1)
+        return best[0] if best else self.rng.choice(self.hints.words)
+
+STRATEGIES = {
+    "random": RandomStrategy,
+    "consistent": ConsistentStrategy,
+    "entropy": EntropyStrategy,
+}
+
+def load_strategy(name):
+    # built-in name, or "module:Class" for a strategy living elsewhere
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+    module, _, cls = name.partition(':')
+    return getattr(importlib.import_module(module), cls)
+
+def category_pool(category):
+    # (target words, max guesses) the game would use for this category
+    lex = get_lexicon()
+    if category in lex.categories:
+        # calibrated max guesses when there are any, like get_random_word
+        return [w.upper() for w in lex.categories[category]['words']], category_diff(category)
+    return [w.upper() for w in lex.all_words], 6
+
+def play_one(target, max_guesses, strategy):
+    # plays one game to the end, returns the winning guess count (0 = lost)
+    game = GameEngine(target, max_guesses)
+    strategy.start(game)
+    while not game.over:
+        game.submit(strategy.guess(game))
+    return len(game.guesses) if game.result['res'] == "WIN" else 0
+
+def run_batch(job):
+    # worker entry: (strategy name, category, games, seed) -> (category, Counter)
+    name, category, games, seed = job
+    rng = random.Random(seed)
+    strategy = load_strategy(name)(category, rng)
+    targets, max_guesses = category_pool(category)
+    dist = Counter()
+    for _ in range(games):
+        dist[play_one(rng.choice(targets), max_guesses, strategy)] += 1
+    return category, dist
+
+def simulate(strategy="entropy", games=10000, workers=None, categories=None, seed=0, batch=500):
+    # spreads the playouts over a process pool; returns ({category: Counter}, seconds)
+    if categories is None:
+        categories = list(get_lexicon().cat_names)
+    jobs = []
+    for category in categories:
+        for lo in range(0, games, batch):
+            jobs.append((strategy, category, min(batch, games - lo), seed + len(jobs)))
+
+    start = time.perf_counter()
+    results = {category: Counter() for category in categories}
+    with multiprocessing.Pool(workers) as pool:
+        for category, dist in pool.imap_unordered(run_batch, jobs):
+            results[category].update(dist)
+    return results, time.perf_counter() - start
+
+def report(results, seconds):
+    total = 0
+    for category, dist in results.items():
+        n = sum(dist.values())
+        wins = n - dist[0]
+        total += n
+        mean = sum(k * v for k, v in dist.items()) / wins if wins else 0
+        _, max_guesses = category_pool(category)
+        bars = " ".join(f"{k}:{dist[k] / n:5.1%}" for k in range(1, max_guesses + 1))
+        print(f"{category:<12} win {wins / n:6.1%}  mean {mean:4.2f}  {bars}  X:{dist[0] / n:5.1%}")
+    print(f"{total} games in {seconds:.2f}s ({total / seconds:,.0f} games/s)")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    name = args[0] if len(args) > 0 else "entropy"
+    games = int(args[1]) if len(args) > 1 else 10000
+    workers = int(args[2]) if len(args) > 2 else None
+    category = args[3] if len(args) > 3 else "ALL"
+    categories = None if category == "ALL" else [category]
+    report(*simulate(name, games, workers, categories))
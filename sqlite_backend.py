@@ -0,0 +1,289 @@
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+import file_system
+from file_system import (DATABASE_FILE, SESSION_CAPACITY, PLAYERS, SESSIONS, TIME_STATS, FLAT,
+                         ensure_data_dir, parse_user_str, parse_session, parse_time_record)
+from structures import Leaderboard
+
+# users, sessions and time attack scores in one SQLite database (WORDLE_BACKEND=sqlite)
+# every query is an indexed lookup or an ordered LIMIT, so boards of 100k+ players
+# cost the same as 20; statements are constants, so sqlite3 prepares each one once
+# usage: python sqlite_backend.py migrate
+
+TIME_CAPACITY = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY, avg_time REAL NOT NULL, games INTEGER NOT NULL,
+    total_time REAL NOT NULL, last_word TEXT, last_guesses TEXT);
+CREATE INDEX IF NOT EXISTS players_by_avg ON players (avg_time);
+CREATE TABLE IF NOT EXISTS sessions (
+    name TEXT PRIMARY KEY, target TEXT NOT NULL, guesses TEXT NOT NULL,
+    category TEXT NOT NULL, played REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS sessions_by_played ON sessions (played);
+CREATE TABLE IF NOT EXISTS time_scores (
+    id INTEGER PRIMARY KEY, dur INTEGER NOT NULL, score INTEGER NOT NULL, name TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS time_scores_by_rank ON time_scores (score DESC, dur DESC, id);
+CREATE INDEX IF NOT EXISTS time_scores_by_name ON time_scores (name);
+"""
+
+# synchronous level for each file_system.DURABILITY setting
+SYNCHRONOUS = {"none": "OFF", "file": "NORMAL", "dir": "FULL"}
+
+GET_META = "SELECT value FROM meta WHERE key = ?"
+PUT_META = "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)"
+
+PLAYER_COLUMNS = "name, avg_time, games, total_time, last_word, last_guesses"
+GET_PLAYER = f"SELECT {PLAYER_COLUMNS} FROM players WHERE name = ?"
+TOP_PLAYERS = f"SELECT {PLAYER_COLUMNS} FROM players ORDER BY avg_time, rowid LIMIT ?"
+COUNT_PLAYERS = "SELECT COUNT(*) FROM players"
+PUT_PLAYER = f"""INSERT INTO players ({PLAYER_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (name) DO UPDATE SET avg_time = excluded.avg_time, games = excluded.games,
+    total_time = excluded.total_time, last_word = excluded.last_word, last_guesses = excluded.last_guesses"""
+# one statement, so wins recorded by several instances at once all count
+RECORD_WIN = f"""INSERT INTO players ({PLAYER_COLUMNS}) VALUES (:name, :time, 1, :time, :word, :guesses)
+    ON CONFLICT (name) DO UPDATE SET games = games + 1, total_time = total_time + excluded.total_time,
+    avg_time = (total_time + excluded.total_time) / (games + 1),
+    last_word = excluded.last_word, last_guesses = excluded.last_guesses"""
+
+SESSION_NAMES = "SELECT name FROM sessions ORDER BY rowid"
+GET_SESSION = "SELECT target, guesses, category FROM sessions WHERE name = ?"
+COUNT_SESSIONS = "SELECT COUNT(*) FROM sessions"
+EVICT_SESSIONS = "DELETE FROM sessions WHERE name IN (SELECT name FROM sessions ORDER BY played LIMIT ?)"
+PUT_SESSION = """INSERT INTO sessions (name, target, guesses, category, played) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (name) DO UPDATE SET target = excluded.target, guesses = excluded.guesses,
+    category = excluded.category, played = excluded.played"""
+DELETE_SESSION = "DELETE FROM sessions WHERE name = ?"
+
+PUT_TIME = "INSERT INTO time_scores (dur, score, name) VALUES (?, ?, ?)"
+TOP_TIMES = "SELECT dur, score, name FROM time_scores ORDER BY score DESC, dur DESC, id LIMIT ?"
+TRIM_TIMES = """DELETE FROM time_scores WHERE id NOT IN
+    (SELECT id FROM time_scores ORDER BY score DESC, dur DESC, id LIMIT ?)"""
+
+def player_row(row):
+    name, avg_time, games, total_time, word, guesses = row
+    return {'name': name, 'avg_time': avg_time, 'games': games, 'total_time': total_time,
+            'last_word': word, 'last_guesses': guesses}
+
+class SQLiteBackend:
+    def __init__(self, path=DATABASE_FILE, session_capacity=SESSION_CAPACITY, import_files=True):
+        self.path = path
+        self.import_files = import_files   # a new database starts with the .bin files' contents
+        self.session_capacity = session_capacity
+        self.con = None
+        self.lock = threading.RLock()   # one connection, shared by every thread
+        self.depth = 0
+        self.writes = 0                 # our own commits; other connections show in data_version
+        self.time_view = None           # (version, cached leaderboard list)
+        self.migrated = None            # what the first open copied from the .bin files
+
+    def connect(self):
+        with self.lock:
+            if self.con is None:
+                if self.path == DATABASE_FILE:
+                    ensure_data_dir()
+                con = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False, timeout=5.0)
+                con.execute("PRAGMA journal_mode=WAL")
+                con.execute(f"PRAGMA synchronous={SYNCHRONOUS.get(file_system.DURABILITY, 'NORMAL')}")
+                con.executescript(SCHEMA)
+                self.con = con
+                if self.import_files:
+                    self.migrated = migrate(self)
+            return self.con
+
+    def version(self):
+        # changes whenever anyone, this process or another, commits
+        with self.lock:
+            return (self.connect().execute("PRAGMA data_version").fetchone()[0], self.writes)
+
+    @contextmanager
+    def transaction(self):
+        # nested blocks join the outermost one; BEGIN IMMEDIATE takes the write lock up front
+        with self.lock:
+            con = self.connect()
+            if self.depth == 0:
+                con.execute("BEGIN IMMEDIATE")
+            self.depth += 1
+            try:
+                yield con
+            except BaseException:
+                self.depth -= 1
+                if self.depth == 0:
+                    con.execute("ROLLBACK")
+                raise
+            self.depth -= 1
+            if self.depth == 0:
+                con.execute("COMMIT")
+                self.writes += 1
+
+    def batch(self):
+        return self.transaction()
+
+    def run(self, what, fn):
+        # fn(connection) inside a transaction; False (and a message) if the database refused
+        try:
+            with self.transaction() as con:
+                fn(con)
+            return True
+        except sqlite3.Error as e:
+            print(f"Error saving {what}: {e}")
+            return False
+
+    # time attack
+    def save_time_score(self, duration, score, username):
+        def write(con):
+            con.execute(PUT_TIME, (int(duration), score, username))
+            con.execute(TRIM_TIMES, (TIME_CAPACITY,))
+        if not self.run("Time Attack leaderboard", write):
+            return
+        self.time_view = None
+
+    def refresh_time_stats(self):
+        self.time_view = None
+
+    def load_time_stats_list(self):
+        # sorted list of dictionaries for the leaderboard UI (cached, do not modify)
+        version = self.version()
+        if self.time_view is None or self.time_view[0] != version:
+            with self.lock:
+                rows = self.connect().execute(TOP_TIMES, (TIME_CAPACITY,)).fetchall()
+            self.time_view = (version, [{'dur': d, 'score': s, 'name': n} for d, s, n in rows])
+        return self.time_view[1]
+
+    def load_time_stats(self):
+        best = {}
+        for r in self.load_time_stats_list():
+            best.setdefault(r['dur'], {'score': r['score'], 'name': r['name']})
+        return best
+
+    # users: the players table holds everyone, so saving never deletes
+    def save_users(self, ll):
+        rows = [(d['name'], d['avg_time'], d['games'], d['total_time'], d.get('last_word', 'N/A'),
+                 d.get('last_guesses', '')) for d in ll.to_list()]
+        self.run("match history", lambda con: con.executemany(PUT_PLAYER, rows))
+
+    def load_users(self):
+        ll = Leaderboard()
+        with self.lock:
+            ll.extend(map(player_row, self.connect().execute(TOP_PLAYERS, (ll.capacity,))))
+        return ll
+
+    def load_player_stats(self):
+        return PlayerStats(self)
+
+    # sessions
+    def get_session_users(self):
+        file_system.PERSIST.flush() # queued saves aren't indexed anywhere else
+        with self.lock:
+            return [name for name, in self.connect().execute(SESSION_NAMES)]
+
+    def save_session(self, username, state):
+        # saves or updates player's session, evicting the least recently played when full
+        def write(con):
+            if self.session_capacity is not None and not con.execute(GET_SESSION, (username,)).fetchone():
+                extra = con.execute(COUNT_SESSIONS).fetchone()[0] - self.session_capacity + 1
+                if extra > 0:
+                    con.execute(EVICT_SESSIONS, (extra,))
+            con.execute(PUT_SESSION, (username, state['target'], ",".join(state['guesses']),
+                                      state['category'], time.time()))
+        return self.run("session", write)
+
+    def save_session_later(self, username, state):
+        return file_system.persist(self.save_session, username, state)
+
+    def delete_session(self, username):
+        if not self.run("session", lambda con: con.execute(DELETE_SESSION, (username,))):
+            print(f"Error clearing session for {username}")
+
+    def load_session(self, username):
+        file_system.PERSIST.flush()
+        with self.lock:
+            row = self.connect().execute(GET_SESSION, (username,)).fetchone()
+        if row is None: return None
+        target, guesses, category = row
+        return {"target": target, "guesses": guesses.split(',') if guesses else [], "category": category}
+
+class PlayerStats:
+    # same interface as file_system.PlayerStats, answered by indexed queries;
+    # only the top-20 view is kept in memory
+    def __init__(self, db, view_size=20):
+        self.db = db
+        self.view_size = view_size
+        self.view = None    # (version, rows)
+
+    def __len__(self):
+        with self.db.lock:
+            return self.db.connect().execute(COUNT_PLAYERS).fetchone()[0]
+
+    def find_user(self, name):
+        with self.db.lock:
+            row = self.db.connect().execute(GET_PLAYER, (name,)).fetchone()
+        return player_row(row) if row else None
+
+    def refresh(self):
+        self.view = None
+        return self
+
+    def to_list(self):
+        # cached top-20 view, requeried once someone commits
+        version = self.db.version()
+        if self.view is None or self.view[0] != version:
+            with self.db.lock:
+                rows = self.db.connect().execute(TOP_PLAYERS, (self.view_size,)).fetchall()
+            self.view = (version, [player_row(r) for r in rows])
+        return self.view[1]
+
+    def record_win(self, name, play_time, word='N/A', guesses=''):
+        args = {'name': name, 'time': float(play_time), 'word': word, 'guesses': guesses}
+        self.db.run("match history", lambda con: con.execute(RECORD_WIN, args))
+        return self.find_user(name)
+
+def migrate(db, force=False):
+    # one-shot copy of the .bin files; returns (players, sessions, scores) copied,
+    # or None if this database was already migrated
+    with db.transaction() as con:
+        if con.execute(GET_META, ("migrated",)).fetchone() and not force:
+            return None
+        if force:
+            con.execute("DELETE FROM sessions")
+            con.execute("DELETE FROM time_scores")
+
+        players = [d for d in map(parse_user_str, PLAYERS.values()) if d] or FLAT.load_users().to_list()
+        con.executemany(PUT_PLAYER, [(d['name'], d.get('avg_time', 0.0), d.get('games', 0), d.get('total_time', 0.0),
+                                      d.get('last_word', 'N/A'), d.get('last_guesses', '')) for d in players if 'name' in d])
+
+        sessions = []
+        for name, line in SESSIONS.items():
+            s = parse_session(line)
+            sessions.append((name, s['target'], ",".join(s['guesses']), s['category'], s['played']))
+        con.executemany(PUT_SESSION, sessions)
+
+        scores = []
+        for key, entry in sorted(TIME_STATS.items(), key=lambda kv: int(kv[0])):
+            try:
+                r = parse_time_record(entry)
+                scores.append((r['dur'], r['score'], r['name']))
+            except (ValueError, IndexError):
+                print(f"Skipping corrupt stat: {entry}")
+        con.executemany(PUT_TIME, scores)
+        con.execute(TRIM_TIMES, (TIME_CAPACITY,))
+
+        con.execute(PUT_META, ("migrated", f"{time.time():.3f}"))
+    return len(players), len(sessions), len(scores)
+
+if __name__ == "__main__":
+    what = sys.argv[1] if len(sys.argv) > 1 else "migrate"
+    if what == "migrate":
+        db = SQLiteBackend()
+        db.connect()    # a new database migrates as it opens
+        counts = migrate(db, force=True) if "--force" in sys.argv else db.migrated
+        if counts is None:
+            print(f"{db.path} already migrated (--force copies the files again)")
+        else:
+            print(f"copied {counts[0]} players, {counts[1]} sessions, {counts[2]} time attack scores into {db.path}")
+    else:
+        print(f"unknown command: {what}")
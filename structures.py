@@ -1,97 +1,206 @@
+from bisect import bisect_left, insort
+
 class Node:
     def __init__(self, data):
         self.data = data
         self.next = None
+        self.prev = None # only used by Stack to drop its oldest entry
 
-class LinkedList:
-    # stores top-20 based on avg time
-    def __init__(self):
-        self.head = None
-        self.size = 0
+class Leaderboard:
+    # top players by avg time, indexed:
+    # name -> entry hash for O(1) lookups, plus a bisect-maintained list
+    # of (avg_time, seq, name) keys for O(log n) upserts and O(k) top-k
+    def __init__(self, capacity=20):
+        self.capacity = capacity
+        self.index = {}   # name -> (key, user_data)
+        self.order = []   # sorted keys, fastest first
+        self.seq = 0      # ties keep insertion order
+
+    @property
+    def size(self):
+        return len(self.order)
+
+    def __len__(self):
+        return len(self.order)
+
+    def next_key(self, user_data):
+        self.seq += 1
+        return (user_data['avg_time'], self.seq, user_data['name'])
 
     def add_sorted(self, user_data):
-        new_node = Node(user_data)
-        
-        # C1: Empty list/new user faster than head
-        if self.head is None or user_data['avg_time'] < self.head.data['avg_time']:
-            new_node.next = self.head
-            self.head = new_node
-        else:
-            # C2: Find corrent pos
-            current = self.head
-
-            while current.next and current.next.data['avg_time'] <= user_data['avg_time']:
-                current = current.next
-            new_node.next = current.next
-            current.next = new_node
-        
-        self.size += 1
+        # inserts or replaces the user's entry
+        self.remove_user(user_data['name'])
+        key = self.next_key(user_data)
+        insort(self.order, key)
+        self.index[user_data['name']] = (key, user_data)
+        self.trim_to_20()
+
+    def extend(self, users):
+        # bulk load: one sort instead of an insert per user
+        # a repeated name just overwrites its index entry; order is rebuilt from the index
+        for user_data in users:
+            self.index[user_data['name']] = (self.next_key(user_data), user_data)
+        self.order = sorted(key for key, _ in self.index.values())
         self.trim_to_20()
 
     def trim_to_20(self):
-        # limits leaderboard to 20 players
-        if self.size <= 20: return
-        curr = self.head
-        for _ in range(19): 
-            if curr: curr = curr.next
-        if curr: curr.next = None 
-        self.size = 20
+        # limits leaderboard to capacity players (None = unbounded)
+        if self.capacity is None: return
+        while len(self.order) > self.capacity:
+            key = self.order.pop()
+            del self.index[key[2]]
 
     def find_user(self, name):
         # find user data by name
-        curr = self.head
-        while curr:
-            if curr.data['name'] == name:
-                return curr.data
-            curr = curr.next
-        return None
-        
-    def to_list(self):
-        # convert linked list to regular list
-        result = []
-        curr = self.head
-        while curr:
-            result.append(curr.data)
-            curr = curr.next
-        return result
-    
+        entry = self.index.get(name)
+        return entry[1] if entry else None
+
     def remove_user(self, name):
-        # removes all nodes with the matching username
-        # returns True if at least one user was removed
-        removed = False
-        
-        # head removal
-        while self.head and self.head.data['name'] == name:
-            self.head = self.head.next
-            self.size -= 1
-            removed = True
-            
-        # body removal
-        current = self.head
-        while current and current.next:
-            if current.next.data['name'] == name:
-                current.next = current.next.next
-                self.size -= 1
-                removed = True
-            else:
-                current = current.next
-                
-        return removed
+        # returns True if the user was removed
+        entry = self.index.pop(name, None)
+        if entry is None: return False
+        pos = bisect_left(self.order, entry[0])
+        del self.order[pos]
+        return True
+
+    def rank(self, name):
+        # 0-based position of the user, or None
+        entry = self.index.get(name)
+        return bisect_left(self.order, entry[0]) if entry else None
+
+    def top(self, k):
+        # first k entries, fastest first
+        return [self.index[key[2]][1] for key in self.order[:k]]
+
+    def to_list(self):
+        # convert leaderboard to regular list
+        return [self.index[key[2]][1] for key in self.order]
+
+class TimeAttackBoard:
+    # time attack scores, parsed once into typed records
+    # sorted best first overall by (-score, -dur, seq) and per duration by (-score, seq),
+    # so inserts are O(log n) searches and top-k is a slice
+    def __init__(self, capacity=20):
+        self.capacity = capacity
+        self.records = {}   # seq -> {'dur': int, 'score': int, 'name': str}
+        self.order = []     # overall sort keys
+        self.by_dur = {}    # dur -> sort keys for that duration
+        self.version = 0    # bumped on every change
+        self.view = None    # cached to_list()
+
+    def __len__(self):
+        return len(self.order)
+
+    def add(self, seq, dur, score, name):
+        self.remove(seq)
+        self.records[seq] = {'dur': dur, 'score': score, 'name': name}
+        insort(self.order, (-score, -dur, seq))
+        insort(self.by_dur.setdefault(dur, []), (-score, seq))
+        self.changed()
+
+    def remove(self, seq):
+        r = self.records.pop(seq, None)
+        if r is None: return False
+        del self.order[bisect_left(self.order, (-r['score'], -r['dur'], seq))]
+        keys = self.by_dur[r['dur']]
+        del keys[bisect_left(keys, (-r['score'], seq))]
+        if not keys: del self.by_dur[r['dur']]
+        self.changed()
+        return True
+
+    def changed(self):
+        self.version += 1
+        self.view = None
+
+    def overflow(self):
+        # seqs that fell below the capacity
+        if self.capacity is None: return []
+        return [key[2] for key in self.order[self.capacity:]]
+
+    def top(self, k=None, dur=None):
+        # best k records overall, or for one duration
+        if dur is None:
+            return [self.records[key[2]] for key in self.order[:k]]
+        return [self.records[key[1]] for key in self.by_dur.get(dur, [])[:k]]
+
+    def best(self):
+        # dur -> best record for that duration
+        return {dur: self.records[keys[0][1]] for dur, keys in self.by_dur.items()}
+
+    def to_list(self):
+        # cached, best first; rebuilt only after a change
+        if self.view is None:
+            self.view = self.top()
+        return self.view
+
+class GameState:
+    # immutable game state: guesses form a persistent linked list where every
+    # state points at the one before it, so states share their common tail and
+    # adding a guess is O(1) with nothing copied
+    __slots__ = ('guess', 'parent', 'length', 'keys', '_guesses')
+
+    def __init__(self, guess=None, parent=None, keys=None):
+        self.guess = guess
+        self.parent = parent
+        self.length = parent.length + 1 if parent is not None else 0
+        self.keys = keys          # keyboard status snapshot after this guess
+        self._guesses = None      # cached tuple, filled on first read
+
+    @classmethod
+    def from_guesses(cls, guesses, keys=None):
+        state = cls()
+        for g in guesses:
+            state = state.push(g)
+        state.keys = keys
+        return state
+
+    def push(self, guess, keys=None):
+        return GameState(guess, self, keys)
+
+    def __len__(self):
+        return self.length
+
+    def guesses(self):
+        # guesses oldest first; computed once per state
+        if self._guesses is None:
+            out = []
+            node = self
+            while node.parent is not None:
+                out.append(node.guess)
+                node = node.parent
+            self._guesses = tuple(reversed(out))
+        return self._guesses
 
 class Stack:
     # undo/redo feature
-    def __init__(self):
+    # limit caps the history; the oldest entry is dropped on overflow
+    def __init__(self, limit=None):
         self.top = None
+        self.bottom = None
+        self.size = 0
+        self.limit = limit
 
     def push(self, data):
+        if self.limit == 0: return  # history switched off
         node = Node(data)
         node.next = self.top
+        if self.top: self.top.prev = node
+        else: self.bottom = node
         self.top = node
+        self.size += 1
+
+        if self.limit is not None and self.size > self.limit:
+            self.bottom = self.bottom.prev
+            self.bottom.next = None
+            self.size -= 1
 
     def pop(self):
         if not self.top: return None
         data = self.top.data
         self.top = self.top.next
+        if self.top: self.top.prev = None
+        else: self.bottom = None
+        self.size -= 1
         return data
 
     def is_empty(self):
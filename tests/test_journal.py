@@ -0,0 +1,74 @@
+import shutil
+from file_system import WRITER, Journal, session_key, time_key, time_order
+
+def session(name, word="TIGER"):
+    return f"{name}|{word}||ANIMALS|0.000"
+
+def reopen(j):
+    WRITER.flush()
+    fresh = Journal(j.path, j.sep, j.key_of, j.order, j.min_garbage)
+    fresh.load()
+    return fresh
+
+def test_torn_log_tail_is_cut(tmp_path):
+    j = Journal(str(tmp_path / "s.bin"), "\n", session_key)
+    j.put("a", session("a"))
+    j.put("b", session("b"))
+    WRITER.flush()
+    good = (tmp_path / "s.bin.log").stat().st_size
+    with open(j.log_path, "ab") as f:
+        f.write(j.frame(f"Pc\0{session('c')}")[:-3]) # crashed halfway through a record
+
+    fresh = reopen(j)
+    assert fresh.entries == {"a": session("a"), "b": session("b")}
+    assert (tmp_path / "s.bin.log").stat().st_size == good
+
+def test_stale_log_after_interrupted_compaction(tmp_path):
+    j = Journal(str(tmp_path / "s.bin"), "\n", session_key)
+    j.put("a", session("a", "EAGLE"))
+    WRITER.flush()
+    shutil.copy(j.log_path, tmp_path / "old.log")
+    j.put("a", session("a", "SHARK"))
+    j.compact()
+    WRITER.flush()
+    # the snapshot landed but the crash left the old log behind
+    shutil.copy(tmp_path / "old.log", j.log_path)
+
+    fresh = reopen(j)
+    assert fresh.entries == {"a": session("a", "SHARK")}
+
+def test_rekey_after_compaction(tmp_path):
+    j = Journal(str(tmp_path / "t.bin"), "|", time_key, order=time_order)
+    for score in [3, 9, 5]:
+        j.put(j.next_key(), f"60:{score}:p{score}")
+    j.delete("0")
+    j.compact()
+    # keys follow the snapshot order now, as a reload would read them
+    assert j.entries == {"0": "60:9:p9", "1": "60:5:p5"}
+
+    j.delete("1")
+    j.put(j.next_key(), "60:7:p7")
+    fresh = reopen(j)
+    assert fresh.entries == j.entries == {"0": "60:9:p9", "1": "60:7:p7"}
+
+def test_maybe_compact_thresholds(tmp_path):
+    j = Journal(str(tmp_path / "s.bin"), "\n", session_key, min_garbage=4)
+    for name in "abcdef":
+        j.put(name, session(name))
+
+    # below min_garbage: no compaction
+    for word in ["EAGLE", "SHARK", "PANDA"]:
+        j.put("a", session("a", word))
+    assert j.garbage == 3 and j.compactor is None
+
+    # past min_garbage but not more garbage than live entries
+    j.put("a", session("a", "ZEBRA"))
+    assert j.garbage == 4 and j.compactor is None
+
+    # more garbage than entries compacts in the background
+    for word in ["KOALA", "HORSE", "SHEEP"]:
+        j.put("a", session("a", word))
+    assert j.compactor is not None
+    j.compactor.join()
+    assert j.garbage == 0
+    assert reopen(j).entries == j.entries
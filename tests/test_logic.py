@@ -0,0 +1,22 @@
+import os
+import pytest
+from file_system import get_lexicon
+from logic import verify_batch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture(autouse=True)
+def repo_root(monkeypatch):
+    # the data paths are relative to the repo
+    monkeypatch.chdir(ROOT)
+
+def test_batch_matches_score_guess_on_lexicon():
+    words = get_lexicon().all_words
+    assert len(words) > 0
+    assert verify_batch(words) == []
+
+def test_batch_matches_score_guess_on_repeated_letters():
+    # repeated letters in the guess, the target, or both are where greens and yellows compete
+    words = ["EERIE", "LLAMA", "ABBEY", "SASSY", "MAMMA", "PEPPY", "ALLAY", "SPEED",
+             "ERASE", "GEESE", "TEETH", "NANNY", "BOOBS", "ELDER", "EAGLE", "TIGER"]
+    assert verify_batch(words) == []
@@ -0,0 +1,56 @@
+from engine import GameEngine
+from structures import GameState, Stack
+
+def drain(stack):
+    out = []
+    while not stack.is_empty():
+        out.append(stack.pop())
+    return out
+
+def test_stack_push_pop():
+    s = Stack()
+    assert s.pop() is None
+    for i in range(3):
+        s.push(i)
+    assert s.size == 3
+    assert drain(s) == [2, 1, 0]
+    assert s.size == 0 and s.bottom is None
+
+def test_stack_limit_drops_oldest():
+    s = Stack(2)
+    for i in range(5):
+        s.push(i)
+    assert s.size == 2
+    assert drain(s) == [4, 3]
+
+def test_stack_zero_limit_keeps_nothing():
+    s = Stack(0)
+    s.push("a")
+    assert s.is_empty() and s.size == 0
+    assert s.pop() is None
+
+def test_undo_limit_caps_history():
+    game = GameEngine("TIGER", 6, undo_limit=2)
+    for g in ["EAGLE", "SHARK", "PANDA", "ZEBRA"]:
+        game.submit(g)
+    assert game.undo() and game.undo()
+    assert not game.undo()
+    assert list(game.guesses) == ["EAGLE", "SHARK"]
+    assert game.redo()
+    assert list(game.guesses) == ["EAGLE", "SHARK", "PANDA"]
+
+def test_undo_limit_zero():
+    game = GameEngine("TIGER", 6, undo_limit=0)
+    game.submit("EAGLE")
+    assert not game.undo()
+    assert list(game.guesses) == ["EAGLE"]
+
+def test_game_state_shared_parent():
+    base = GameState.from_guesses(["EAGLE", "SHARK"])
+    left = base.push("PANDA")
+    right = base.push("ZEBRA").push("KOALA")
+    assert (len(GameState()), len(base), len(left), len(right)) == (0, 2, 3, 4)
+    assert left.parent is base and right.parent.parent is base
+    assert list(left.guesses()) == ["EAGLE", "SHARK", "PANDA"]
+    assert list(right.guesses()) == ["EAGLE", "SHARK", "ZEBRA", "KOALA"]
+    assert list(base.guesses()) == ["EAGLE", "SHARK"]